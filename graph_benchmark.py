@@ -0,0 +1,259 @@
+"""A gráfmodell műveleteinek teljesítménymérése különböző szerkezetű és méretű, véletlenszerűen generált
+gráfokon. Az eredményt JSON formátumban adja ki, és egy korábbi mérés eredményével összevetve jelzi a
+lassulásokat és a memóriacsúcs növekedéseit.
+
+Példák:
+    python graph_benchmark.py --sizes 1000 10000 --output eredmeny.json
+    python graph_benchmark.py --baseline eredmeny.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from time import perf_counter
+from graph_model import Graph
+
+# Egy generált gráf: élek (kezdőcsúcs, végcsúcs, súly) hármasokként és az, hogy az élek irányítottak-e.
+Edges = tuple[list[tuple[str, str, int]], bool]
+
+
+def random_sparse_graph(n: int, seed: int, average_degree: int = 4) -> Edges:
+    """Irányított véletlen gráf n csúccsal és n * average_degree éllel, 1 és 10 közötti súlyokkal."""
+    rng = random.Random(seed)
+    edges = [(str(rng.randrange(n)), str(rng.randrange(n)), rng.randint(1, 10)) for _ in range(n * average_degree)]
+    # Minden csúcs szerepeljen legalább egy élben, hogy a gráf csúcsszáma pontosan n legyen.
+    edges.extend((str(i), str((i + 1) % n), rng.randint(1, 10)) for i in range(n))
+    return edges, True
+
+
+def grid_graph(n: int, seed: int) -> Edges:
+    """Nem irányított négyzetrács körülbelül n csúccsal, véletlen súlyokkal."""
+    rng = random.Random(seed)
+    side = max(int(n ** 0.5), 1)
+    edges = []
+    for row in range(side):
+        for col in range(side):
+            label = str(row * side + col)
+            if col + 1 < side:
+                edges.append((label, str(row * side + col + 1), rng.randint(1, 10)))
+            if row + 1 < side:
+                edges.append((label, str((row + 1) * side + col), rng.randint(1, 10)))
+    return edges, False
+
+
+def scale_free_graph(n: int, seed: int, m: int = 3) -> Edges:
+    """Nem irányított skálafüggetlen gráf a Barabási-Albert modell szerint: minden új csúcs m meglevő
+    csúcshoz kapcsolódik, a fokszámukkal arányos valószínűséggel.
+    """
+    rng = random.Random(seed)
+    edges = []
+    # Minden csúcs annyiszor szerepel a listában, amennyi a fokszáma, így egyenletes választással a
+    # fokszámmal arányos valószínűséget kapunk.
+    endpoints = list(range(min(m, n)))
+    for new in range(min(m, n), n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(endpoints))
+        for target in targets:
+            edges.append((str(new), str(target), rng.randint(1, 10)))
+            endpoints.extend((new, target))
+    return edges, False
+
+
+def chain_graph(n: int, seed: int) -> Edges:
+    """Irányított lánc n csúccsal, ami a mély bejárások és a hosszú utak esete."""
+    rng = random.Random(seed)
+    return [(str(i), str(i + 1), rng.randint(1, 10)) for i in range(n - 1)], True
+
+
+GENERATORS: dict[str, Callable[[int, int], Edges]] = {
+    'sparse': random_sparse_graph,
+    'grid': grid_graph,
+    'scale_free': scale_free_graph,
+    'chain': chain_graph,
+}
+
+
+def build_graph(edges: Edges) -> Graph:
+    edge_list, directed = edges
+    graph = Graph()
+    graph.add_connections(edge_list, directed=directed)
+    return graph
+
+
+def add_connection_loop(edges: Edges) -> Graph:
+    """A gráf felépítése élenként, az add_connection egyenkénti hívásával."""
+    edge_list, directed = edges
+    graph = Graph()
+    for start_label, end_label, weight in edge_list:
+        graph.add_connection(start_label, end_label, weight)
+        if not directed:
+            graph.add_connection(end_label, start_label, weight)
+    return graph
+
+
+def operations(edges: Edges, start_label: str, seed: int) -> dict[str, tuple[Callable[[], object], Callable]]:
+    """A mért műveletek név -> (előkészítés, művelet) párokként. Az előkészítés eredményét kapja meg
+    a művelet, és az előkészítés ideje nem számít bele a mérésbe.
+    """
+    rng = random.Random(seed)
+    graph = build_graph(edges)
+    compact_graph = graph.freeze()
+    labels = list(graph.vertices)
+    removed_vertices = rng.sample(labels, max(len(labels) // 100, 1))
+    edge_pairs = sorted({(start, end) for start, neighbors in graph.neighbors.items() for end, _ in neighbors})
+    removed_edges = rng.sample(edge_pairs, min(max(len(edge_pairs) // 100, 1), len(edge_pairs)))
+
+    def fresh_graph():
+        graph.clear_cache()
+        return graph
+
+    def warm_graph():
+        graph.shortest_paths(start_label)
+        return graph
+
+    def remove_vertices(g: Graph):
+        for vertex_label in removed_vertices:
+            g.remove_vertex(vertex_label)
+
+    def remove_edges(g: Graph):
+        for start, end in removed_edges:
+            if g.has_edge(start, end):
+                g.remove_edge(start, end)
+
+    return {
+        'add_connection': (lambda: edges, add_connection_loop),
+        'add_connections': (lambda: edges, build_graph),
+        'remove_vertex': (lambda: build_graph(edges), remove_vertices),
+        'remove_edge': (lambda: build_graph(edges), remove_edges),
+        'shortest_paths': (fresh_graph, lambda g: g.shortest_paths(start_label)),
+        'shortest_paths_cached': (warm_graph, lambda g: g.shortest_paths(start_label)),
+        'shortest_paths_target': (fresh_graph, lambda g: g.shortest_paths(start_label, labels[-1])),
+        'breadth_first_traversal': (fresh_graph, lambda g: g.breadth_first_traversal(start_label)),
+        'breadth_first_iterator': (fresh_graph, lambda g: sum(1 for _ in g.breadth_first_iterator(start_label))),
+        'depth_first_iterator': (fresh_graph, lambda g: sum(1 for _ in g.depth_first_iterator(start_label))),
+        'freeze': (lambda: graph, Graph.freeze),
+        'compact_shortest_paths': (lambda: compact_graph, lambda g: g.shortest_paths(start_label)),
+        'compact_breadth_first_traversal': (lambda: compact_graph,
+                                            lambda g: g.breadth_first_traversal(start_label)),
+        'compact_depth_first_traversal': (lambda: compact_graph, lambda g: g.depth_first_traversal(start_label)),
+    }
+
+
+def measure(setup: Callable[[], object], operation: Callable, repeat: int) -> dict:
+    """A művelet legrövidebb futásideje repeat ismétlésből, és egy külön futás alatti memóriacsúcs.
+    A memóriát a tracemalloc méri, ami lassítja a futást, ezért az időmérés nélküle történik.
+    """
+    times = []
+    for _ in range(repeat):
+        argument = setup()
+        start = perf_counter()
+        operation(argument)
+        times.append(perf_counter() - start)
+    argument = setup()
+    tracemalloc.start()
+    try:
+        operation(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(times), 'mean_seconds': sum(times) / len(times), 'peak_bytes': peak}
+
+
+def run_benchmarks(families: list[str], sizes: list[int], operation_names: list[str] | None = None,
+                   repeat: int = 3, seed: int = 0, progress: Callable[[str], None] | None = None) -> dict:
+    """Az összes kért gráfcsalád, méret és művelet mérése. Az eredmény JSON formátumba írható szótár."""
+    results = []
+    for family in families:
+        for size in sizes:
+            edges = GENERATORS[family](size, seed)
+            for name, (setup, operation) in operations(edges, '0', seed).items():
+                if operation_names and name not in operation_names:
+                    continue
+                if progress is not None:
+                    progress(f'{family} {size} {name}')
+                result = measure(setup, operation, repeat)
+                results.append({'family': family, 'size': size, 'operation': name, **result})
+    return {
+        'meta': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                 'platform': platform.platform(), 'seed': seed, 'repeat': repeat,
+                 'date': datetime.now(timezone.utc).isoformat(timespec='seconds')},
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float, min_seconds: float,
+            min_bytes: int = 0) -> list[dict]:
+    """A baseline méréshez képest threshold aránynál többel lassabb vagy nagyobb memóriacsúcsú műveletek
+    listája. Minden eltérés a mért mennyiség nevét (metric: seconds vagy peak_bytes), a korábbi és az új
+    értékét, valamint ezek arányát tartalmazza. A min_seconds-nál kisebb időbeli, illetve a min_bytes-nál
+    kisebb memóriabeli abszolút eltérést mérési zajnak tekinti.
+    """
+    baseline_results = {(r['family'], r['size'], r['operation']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = baseline_results.get((result['family'], result['size'], result['operation']))
+        if old is None:
+            continue
+        for metric, min_difference in (('seconds', min_seconds), ('peak_bytes', min_bytes)):
+            if metric not in old:
+                continue
+            old_value, new_value = old[metric], result[metric]
+            if new_value > old_value * (1 + threshold) and new_value - old_value > min_difference:
+                regressions.append({'family': result['family'], 'size': result['size'],
+                                    'operation': result['operation'], 'metric': metric, 'baseline': old_value,
+                                    'value': new_value, 'ratio': new_value / old_value if old_value else None})
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='A gráfmodell műveleteinek teljesítménymérése.')
+    parser.add_argument('--families', nargs='+', choices=sorted(GENERATORS), default=list(GENERATORS),
+                        help='a mérendő gráfcsaládok')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000],
+                        help='a gráfok csúcsszámai')
+    parser.add_argument('--operations', nargs='+', default=None, help='csak ezek a műveletek mérése')
+    parser.add_argument('--repeat', type=int, default=3, help='ismétlések száma műveletenként')
+    parser.add_argument('--seed', type=int, default=0, help='a véletlen gráfok generálásának magja')
+    parser.add_argument('--output', help='az eredmény JSON fájl neve (alapértelmezés: standard kimenet)')
+    parser.add_argument('--baseline', help='korábbi eredmény JSON fájl, amelyhez képest a lassulást jelezzük')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='ennél nagyobb arányú lassulás vagy memóriacsúcs növekedés számít romlásnak '
+                             '(alapértelmezés: 0.25)')
+    parser.add_argument('--min-seconds', type=float, default=0.001,
+                        help='ennél kisebb abszolút lassulás nem számít romlásnak')
+    parser.add_argument('--min-bytes', type=int, default=65536,
+                        help='ennél kisebb abszolút memóriacsúcs növekedés nem számít romlásnak')
+    parser.add_argument('--quiet', action='store_true', help='ne írja ki az előrehaladást')
+    args = parser.parse_args(argv)
+
+    progress = None if args.quiet else lambda text: print(text, file=sys.stderr)
+    report = run_benchmarks(args.families, args.sizes, args.operations, args.repeat, args.seed, progress)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_seconds, args.min_bytes)
+        report['regressions'] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    for regression in regressions:
+        if regression['metric'] == 'seconds':
+            change = f"Lassulás: {regression['baseline']:.6f} s -> {regression['value']:.6f} s"
+        else:
+            change = f"Memóriacsúcs növekedés: {regression['baseline']} B -> {regression['value']} B"
+        print(f"{change} ({regression['family']} {regression['size']} {regression['operation']})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+from collections.abc import Iterator, Mapping
+import numpy as np
+from graph_model import CompactGraph, Graph
+
+
+def force_directed_steps(graph: Graph | CompactGraph, iterations: int = 100, size: float | None = None,
+                         positions: np.ndarray | Mapping[str, tuple[float, float]] | None = None,
+                         seed: int | None = None, gravity: float = 1.0) -> Iterator[np.ndarray]:
+    """Erőalapú (Fruchterman-Reingold) elrendezés lépésenként.
+    A csúcsok egymást taszítják, az élek pedig a végpontjaikat vonzzák. A gravity erősségű, a csúcsok
+    súlypontja felé mutató, a súlyponttól mért távolsággal arányos nehézségi erő miatt a gráf egymással nem
+    összefüggő részei sem távolodnak el korlátlanul. Minden iteráció után kiadja a csúcsok
+    (n, 2) alakú koordinátatömbjét, amelynek i. sora a gráf tömör nézetében i. indexű (CompactGraph.labels)
+    csúcs (x, y) helye. A kiadott tömb a következő iterációban felülíródik, ezért ha meg kell őrizni, akkor
+    másolatot kell róla készíteni.
+    A taszítóerőket Barnes-Hut közelítéssel számítja (lásd _repulsive_forces), így egy iteráció költsége a
+    csúcsok elhelyezkedésétől függetlenül n * log n nagyságrendű.
+    A kezdeti helyek a positions tömbből vagy címke -> (x, y) szótárból származnak; a hiányzó csúcsok
+    helyét (a seed alapján) véletlenszerűen választja a size oldalhosszú négyzetben.
+    """
+    if isinstance(graph, Graph):
+        graph = graph.freeze()
+    n = len(graph)
+    if size is None:
+        size = _default_size(n)
+    coords = _initial_coords(graph, size, positions, seed)
+    if n < 2:
+        for _ in range(iterations):
+            yield coords
+        return
+
+    # Az élek kezdő- és végcsúcsainak indexei. A hurokéleknek nincs hatásuk.
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+    edge_targets = np.frombuffer(graph.targets, dtype=np.int64)
+    edge_sources = np.repeat(np.arange(n), np.diff(offsets))
+    not_loop = edge_sources != edge_targets
+    edge_sources, edge_targets = edge_sources[not_loop], edge_targets[not_loop]
+
+    k = size / np.sqrt(n)  # Az ideális éltávolság.
+    temperature = size / 10  # Egy lépésben megengedett legnagyobb elmozdulás, ami fokozatosan csökken.
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = _repulsive_forces(coords, k)
+        # Nehézségi erő a súlypont felé. Egy r sugarú körben egyenletesen elhelyezkedő n csúcs taszítóereje a
+        # középponttól d távolságra n * k² * d / r² nagyságú, így a gravity értékkel arányos erő a csúcsokat
+        # size / sqrt(gravity) nagyságrendű sugarú körben tartja.
+        displacement -= gravity * (coords - coords.mean(axis=0))
+        # Vonzóerő az élek mentén: d² / k nagyságú, a végpontok felé mutató erő.
+        delta = coords[edge_sources] - coords[edge_targets]
+        force = delta * (np.hypot(delta[:, 0], delta[:, 1]) / k)[:, None]
+        for axis in (0, 1):
+            displacement[:, axis] -= np.bincount(edge_sources, force[:, axis], n)
+            displacement[:, axis] += np.bincount(edge_targets, force[:, axis], n)
+        # Az elmozdulást a hőmérséklettel korlátozzuk.
+        length = np.maximum(np.hypot(displacement[:, 0], displacement[:, 1]), 1e-9)
+        coords += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+        yield coords
+
+
+def force_directed_layout(graph: Graph | CompactGraph, iterations: int = 100, size: float | None = None,
+                          positions: np.ndarray | Mapping[str, tuple[float, float]] | None = None,
+                          seed: int | None = None, gravity: float = 1.0) -> np.ndarray:
+    """Erőalapú elrendezés grafikus felület nélkül. A csúcsok (n, 2) alakú koordinátatömbjét adja vissza,
+    amelynek sorai a gráf tömör nézetének (CompactGraph.labels) sorrendjét követik.
+    """
+    if iterations == 0:
+        # Lépés nélkül a kezdeti helyek maradnak.
+        if isinstance(graph, Graph):
+            graph = graph.freeze()
+        return _initial_coords(graph, _default_size(len(graph)) if size is None else size, positions, seed)
+    for coords in force_directed_steps(graph, iterations, size, positions, seed, gravity):
+        pass
+    return coords
+
+
+def _default_size(n: int) -> float:
+    """Az elrendezés négyzetének alapértelmezett oldalhossza n csúcs esetén."""
+    return 100.0 * max(np.sqrt(n), 1.0)
+
+
+def _initial_coords(graph: CompactGraph, size: float,
+                    positions: np.ndarray | Mapping[str, tuple[float, float]] | None, seed: int | None) -> np.ndarray:
+    """A kezdeti helyek a positions alapján, a hiányzó csúcsoké véletlenszerűen a size oldalhosszú négyzetben."""
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0, size, (len(graph), 2))
+    if isinstance(positions, Mapping):
+        for i, label in enumerate(graph.labels):
+            if (position := positions.get(label)) is not None:
+                coords[i] = position
+    elif positions is not None:
+        coords[:] = positions
+    return coords
+
+
+def _repulsive_forces(coords: np.ndarray, k: float, theta: float = 0.7, max_depth: int = 24) -> np.ndarray:
+    """A csúcsok közötti k² / d nagyságú taszítóerők Barnes-Hut közelítése.
+    A csúcsokat négyesfába rendezi: a gyökér a csúcsokat befoglaló négyzet, és minden csomópont a négy
+    negyedére oszlik, amíg egynél több csúcs esik bele. Egy csúcsra egy csomópont csúcsai a súlypontjukba
+    helyezett, a csúcsok számával arányos erővel hatnak, ha a csomópont oldalhossza a súlyponttól mért
+    távolság theta-szorosánál kisebb, egyébként a csomópont negyedeit kell megvizsgálni. A fa a csúcsok
+    sűrűségéhez igazodik, így egy csúcsra a helyüktől függetlenül log n nagyságrendű csomópont hat.
+    A csomópontok a csúcsok Morton-kódjának (a rácskoordináták bitjeinek összefésülésének) előtagjai, így
+    szintenként a kódok szerint rendezett csúcsok folytonos szeletei, és a fa felépítése és bejárása is
+    szintenként, tömbműveletekkel történik.
+    """
+    n = len(coords)
+    x, y = coords[:, 0], coords[:, 1]
+    low = coords.min(axis=0)
+    extent = max(float((coords.max(axis=0) - low).max()), 1e-9) * (1 + 1e-9)
+    grid = 1 << max_depth
+    cell_x = np.minimum(((x - low[0]) * (grid / extent)).astype(np.uint64), grid - 1)
+    cell_y = np.minimum(((y - low[1]) * (grid / extent)).astype(np.uint64), grid - 1)
+    code = _spread_bits(cell_x) << np.uint64(1) | _spread_bits(cell_y)
+    order = np.argsort(code, kind='stable')
+    sorted_code, sorted_x, sorted_y = code[order], x[order], y[order]
+
+    # Szintenként a csomópontok kódelőtagja, csúcsszáma és súlypontja, valamint a gyermekeik (a következő
+    # szint csomópontjai között folytonos) tartománya.
+    prefixes, counts, centroids_x, centroids_y, children = [], [], [], [], []
+    for level in range(max_depth + 1):
+        prefix = sorted_code >> np.uint64(2 * (max_depth - level))
+        starts = np.concatenate(([0], np.flatnonzero(prefix[1:] != prefix[:-1]) + 1))
+        count = np.diff(np.append(starts, n))
+        prefixes.append(prefix[starts])
+        counts.append(count)
+        centroids_x.append(np.add.reduceat(sorted_x, starts) / count)
+        centroids_y.append(np.add.reduceat(sorted_y, starts) / count)
+        if level:
+            parents = prefixes[level] >> np.uint64(2)
+            children.append((np.searchsorted(parents, prefixes[level - 1], 'left'),
+                             np.searchsorted(parents, prefixes[level - 1], 'right')))
+        if len(starts) == n:
+            break  # Minden csúcs külön csomópontban van.
+    last_level = len(prefixes) - 1
+
+    force_x, force_y = np.zeros(n), np.zeros(n)
+    k2, theta2 = k * k, theta * theta
+    # A még el nem döntött (csúcs, csomópont) párok, kezdetben minden csúcs a gyökérrel.
+    vertex, node = np.arange(n), np.zeros(n, dtype=np.int64)
+    for level in range(last_level + 1):
+        if not len(vertex):
+            break
+        count = counts[level][node]
+        center_x, center_y = centroids_x[level][node], centroids_y[level][node]
+        delta_x, delta_y = x[vertex] - center_x, y[vertex] - center_y
+        distance2 = delta_x * delta_x + delta_y * delta_y
+        side = extent / (1 << level)
+        inside = (code[vertex] >> np.uint64(2 * (max_depth - level))) == prefixes[level][node]
+        accept = (count == 1) | (level == last_level) | (~inside & (side * side < theta2 * distance2))
+        if accept.any():
+            v, count, inside = vertex[accept], count[accept], inside[accept]
+            delta_x, delta_y, distance2 = delta_x[accept], delta_y[accept], distance2[accept]
+            if inside.any():
+                # A csúcsot is tartalmazó csomópontnál (egyelemű vagy a legmélyebb szinten levő) a többi csúcs
+                # súlypontjával számolunk.
+                others = np.maximum(count - 1, 1)
+                delta_x = np.where(inside, x[v] - (center_x[accept] * count - x[v]) / others, delta_x)
+                delta_y = np.where(inside, y[v] - (center_y[accept] * count - y[v]) / others, delta_y)
+                distance2 = delta_x * delta_x + delta_y * delta_y
+                count = count - inside
+            # Az egy helyre eső csúcsokra nem hat erő.
+            weight = np.divide(count * k2, distance2, out=np.zeros_like(distance2), where=distance2 > 0)
+            force_x += np.bincount(v, delta_x * weight, n)
+            force_y += np.bincount(v, delta_y * weight, n)
+        # A túl közeli csomópontok helyett a gyermekeiket vizsgáljuk a következő szinten.
+        refine = ~accept
+        if level == last_level or not refine.any():
+            break
+        first, end = children[level][0][node[refine]], children[level][1][node[refine]]
+        sizes = end - first
+        vertex = np.repeat(vertex[refine], sizes)
+        node = np.repeat(first, sizes) + np.arange(len(vertex)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    return np.stack((force_x, force_y), axis=1)
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """A legfeljebb 32 bites értékek bitjei a 64 bites eredmény páros helyiértékein."""
+    values = values & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
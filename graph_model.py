@@ -1,7 +1,32 @@
-from collections import defaultdict
+import mmap
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property, wraps
+from heapq import heappop, heappush
+from inspect import isgenerator, isgeneratorfunction
+from itertools import chain, filterfalse, islice
+from math import hypot, inf
+from operator import itemgetter
+from os import fstat, replace, stat, unlink
+from os.path import abspath, basename, dirname, join
+from secrets import token_hex
+from time import perf_counter
+from types import MappingProxyType
+
+
+class QueryCancelled(Exception):
+    """A lekérdezést a hívó a futása közben megszakította."""
 
 
 class Vertex:
+    # A csúcsobjektumoknak nincs __dict__ attribútuma, így sok millió csúcs is kevés memóriát foglal.
+    __slots__ = ('label', 'data')
+
     def __init__(self, label, data=None):
         self.label = label
         self.data = data
@@ -12,10 +37,306 @@ class Vertex:
         return f'{type(self).__name__}({args})'
 
 
-class Graph:
+class ShortestPaths(Mapping):
+    """Egy kiinduló csúcstól számított legrövidebb utak eredménye.
+    Csak a legrövidebb úthosszakat és a legrövidebb úton megelőző csúcsokat tárolja, az útvonalakat lekérdezéskor
+    állítja elő. Szótárként használva a célcsúcs címkéjéhez a (legrövidebb úthossz, útvonal) párost adja vissza.
+    Az eredmény csak olvasható, mert a gráf gyorsítótára ugyanazt a példányt adja vissza minden hívónak.
+    """
+
+    def __init__(self, start_vertex_label: str, distances: dict, predecessors: dict):
+        self.start_vertex_label = start_vertex_label
+        # A distances szótár kulcsainak sorrendje a bejárási sorrend, ami a csúcsok gráfba való felvételének
+        # sorrendje. Ezt az eredményt előállító keresés biztosítja.
+        self.distances: Mapping[str, int | float] = MappingProxyType(distances)
+        self.predecessors: Mapping[str, str | None] = MappingProxyType(predecessors)
+
+    def __reduce__(self):
+        # A csak olvasható nézetek nem menthetők, ezért a mögöttük levő szótárak másolatát adjuk át.
+        return type(self), (self.start_vertex_label, dict(self.distances), dict(self.predecessors))
+
+    def __getitem__(self, vertex_label: str):
+        return self.distances[vertex_label], self.path(vertex_label)
+
+    def __iter__(self):
+        return iter(self.distances)
+
+    def __len__(self):
+        return len(self.distances)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({dict(self)})'
+
+    def distance(self, vertex_label: str) -> int | float:
+        """A célcsúcsig vezető legrövidebb út hossza. Ha a csúcs nem érhető el, akkor végtelen."""
+        return self.distances.get(vertex_label, inf)
+
+    def path(self, vertex_label: str) -> list[str]:
+        """A kiinduló csúcstól az argumentumként megadott végcsúcshoz vezető legrövidebb úton levő csúcsok
+        listáját adja vissza. Ha a csúcs nem érhető el, akkor üres listát.
+        """
+        if vertex_label not in self.distances:
+            return []
+        path = [vertex_label]
+        while (previous_vertex := self.predecessors[vertex_label]) is not None:
+            path.append(previous_vertex)
+            vertex_label = previous_vertex
+        return path[-1::-1]
+
+
+class QueryStats:
+    """Egy lekérdezés futásának mérési adatai.
+    A counters szótár az eseményszámlálókat (pl. véglegessé vált csúcsok, megvizsgált élek, prioritási sorba
+    tett elemek, gyorsítótár találatok), a timings szótár pedig a fázisonkénti (pl. élsúlyok ellenőrzése,
+    keresés, eredmény előállítása) futásidőket tartalmazza másodpercben.
+    """
+
+    def __init__(self, query: str, args: tuple):
+        self.query = query
+        self.args = args
+        self.counters: dict[str, int] = defaultdict(int)
+        self.timings: dict[str, float] = defaultdict(float)
+        self.total_time = 0.0
+        self._lap_start = self._start = perf_counter()
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.as_dict()})'
+
+    def __str__(self):
+        args = ', '.join(map(repr, self.args))
+        lines = [f'{self.query}({args}): {self.total_time * 1000:.3f} ms']
+        lines.extend(f'  {phase}: {seconds * 1000:.3f} ms' for phase, seconds in self.timings.items())
+        lines.extend(f'  {counter}: {value}' for counter, value in self.counters.items())
+        return '\n'.join(lines)
+
+    def as_dict(self) -> dict:
+        """A mérési adatok szótárként, pl. egy metrikagyűjtő rendszernek való továbbításhoz."""
+        return dict(query=self.query, args=self.args, total_time=self.total_time,
+                    timings=dict(self.timings), counters=dict(self.counters))
+
+    def lap(self, phase: str):
+        """Az előző fázishatár óta eltelt időt a megadott fázis idejéhez adja."""
+        now = perf_counter()
+        self.timings[phase] += now - self._lap_start
+        self._lap_start = now
+
+    def counting(self, fn: Callable, counter: str) -> Callable:
+        """Az fn függvényt úgy burkolja be, hogy minden hívása eggyel növelje a counter számlálót."""
+        counters = self.counters
+
+        def inner(*args):
+            counters[counter] += 1
+            return fn(*args)
+
+        return inner
+
+    def counting_items(self, fn: Callable, counter: str) -> Callable:
+        """Az fn függvényt úgy burkolja be, hogy minden hívása az eredmény hosszával növelje a counter
+        számlálót. Így egy keresés a csúcsok éleinek lekérdezésekor, külön bejárás nélkül számlálja az éleket.
+        """
+        counters = self.counters
+
+        def inner(*args):
+            result = fn(*args)
+            counters[counter] += len(result)
+            return result
+
+        return inner
+
+    def count_search(self, settled: int):
+        """A legrövidebb út keresés számlálóinak rögzítése. A megvizsgált élek számát a keresés a counting_items
+        burkolóval számlálja. A prioritási sorba tett elemek számához hozzáadja a kiinduló csúcs bejegyzését is,
+        amit a keresés nem a számlált függvénnyel tesz be.
+        """
+        self.counters['settled'] = settled
+        self.counters.setdefault('edges_relaxed', 0)
+        self.counters['queue_pushes'] += 1
+
+
+class Instrumentation:
+    """A gráf lekérdezéseinek opcionális mérése.
+    Minden mért lekérdezés egy QueryStats példányt állít elő, ami a last_stats attribútumba kerül, és
+    átadódik a hooks listában levő függvényeknek. Az egyes szálakon egyszerre futó lekérdezések mérési
+    adatai nem keverednek, mert a futó lekérdezés adatait szálanként tartjuk nyilván.
+    """
+
+    def __init__(self, hooks: Iterable[Callable[[QueryStats], object]] = ()):
+        self.hooks = list(hooks)
+        self.last_stats: QueryStats | None = None
+        self._active = threading.local()
+
+    def current(self) -> QueryStats | None:
+        """Az aktuális szálon éppen futó mért lekérdezés adatai, vagy None."""
+        return getattr(self._active, 'stats', None)
+
+    def call(self, fn: Callable, graph, args: tuple, kwargs: dict):
+        """Az fn lekérdezés futtatása és mérése. Ha az eredmény iterátor, akkor a mérés a bejárás végéig
+        (vagy a bejárás félbehagyásáig) tart, és csak az iterátorban töltött időt számítja.
+        """
+        stats = QueryStats(fn.__name__, args)
+        previous, self._active.stats = self.current(), stats
+        try:
+            result = fn(graph, *args, **kwargs)
+        finally:
+            self._active.stats = previous
+        if isinstance(result, Iterator):
+            return self._iterate(stats, result)
+        if isinstance(result, list):
+            stats.counters['visited'] = len(result)
+        stats.total_time = perf_counter() - stats._start
+        self._finish(stats)
+        return result
+
+    def _iterate(self, stats: QueryStats, iterator: Iterator):
+        next_item = iterator.__next__
+        try:
+            while True:
+                stats._lap_start = perf_counter()
+                try:
+                    item = next_item()
+                except StopIteration:
+                    return
+                finally:
+                    stats.lap('search')
+                stats.counters['visited'] += 1
+                yield item
+        finally:
+            stats.total_time = sum(stats.timings.values())
+            self._finish(stats)
+
+    def _finish(self, stats: QueryStats):
+        self.last_stats = stats
+        for hook in self.hooks:
+            hook(stats)
+
+
+class ParallelArcs(tuple):
+    """Két csúcs között azonos irányban futó, különböző súlyú élek súlyai a fordított szomszédsági indexben.
+    A csúcspárok túlnyomó többségénél csak egy él van, ezekhez az index közvetlenül a súlyt tárolja.
+    """
+    __slots__ = ()
+
+
+def arc_weights(weights) -> tuple:
+    """A fordított szomszédsági indexben egy csúcspárhoz tárolt érték alapján a párhuzamos élek súlyai."""
+    return weights if type(weights) is ParallelArcs else (weights,)
+
+
+def _add_in_arc(predecessors: dict, start_vertex_label: str, weight):
+    """Egy él súlyának felvétele a végcsúcs fordított szomszédsági szótárába. A szomszédsági halmazokhoz
+    hasonlóan az egyenlő súlyú élek egynek számítanak.
+    """
+    if start_vertex_label not in predecessors:
+        predecessors[start_vertex_label] = weight
+    elif weight not in (weights := arc_weights(predecessors[start_vertex_label])):
+        predecessors[start_vertex_label] = ParallelArcs((*weights, weight))
+
+
+class DisjointSets:
+    """Diszjunkt halmazok (unió-holvan) adatszerkezet útösszenyomással és rang szerinti egyesítéssel, így a
+    find és a union műveletek költsége gyakorlatilag állandó. Minden halmaz gyökeréhez a halmaz elemeinek
+    listáját is nyilvántartja. Egyesítéskor a kisebb lista elemei kerülnek át a nagyobba, így egy halmaz elemei
+    a méretével arányos idő alatt, a halmazok száma és mérete pedig azonnal lekérdezhető.
+    """
+
     def __init__(self):
+        self.parent: dict[str, str] = dict()
+        self.rank: dict[str, int] = dict()
+        self.members: dict[str, list[str]] = dict()  # gyökér -> a halmaz elemei
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, item):
+        return item in self.parent
+
+    def add(self, item: str):
+        """Egy új, egyelemű halmazt vesz fel, ha az elem még nem szerepel egyik halmazban sem."""
+        if item not in self.parent:
+            self.parent[item] = item
+            self.rank[item] = 0
+            self.members[item] = [item]
+
+    def find(self, item: str) -> str:
+        """Az elemet tartalmazó halmaz gyökere. A bejárt út elemeit közvetlenül a gyökérhez köti."""
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, item1: str, item2: str) -> bool:
+        """A két elemet tartalmazó halmazokat egyesíti. Hamis, ha a két elem már egy halmazban volt."""
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return False
+        if self.rank[root1] < self.rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if self.rank[root1] == self.rank[root2]:
+            self.rank[root1] += 1
+        members1, members2 = self.members[root1], self.members.pop(root2)
+        if len(members1) < len(members2):
+            members1, members2 = members2, members1
+        members1.extend(members2)
+        self.members[root1] = members1
+        return True
+
+
+class Graph:
+    """Irányított, súlyozott gráf szomszédsági halmazokkal.
+    A lekérdezések (bejárások, legrövidebb utak) minden állapotukat a hívás saját változóiban tartják, a gráfot
+    és a csúcsobjektumokat nem módosítják, így egy félbehagyott bejárás mellett új lekérdezés is indítható, és
+    a gráf több szálról egyszerre is lekérdezhető. A közös eredménytárolót egy zár védi. A gráf módosítása
+    viszont nem történhet egyszerre a lekérdezésekkel: ezt a hívónak kell biztosítania.
+    A csúcsok összefüggő komponenseit (az élek irányától eltekintve) a gráf folyamatosan nyilvántartja, így a
+    connected, component_of, component_size és components lekérdezések nem igényelnek bejárást.
+    """
+
+    def __init__(self, cache_size: int = 128):
         self.vertices: dict[str, Vertex] = dict()
         self.neighbors: dict[str, set[tuple[str, int | float]]] = defaultdict(set)
+        # Fordított szomszédsági index: minden csúcshoz azon csúcsok, amelyekből él vezet bele, az él súlyával.
+        # Ha két csúcs között több, különböző súlyú él is vezet, akkor a súlyokat egy ParallelArcs sorozat
+        # tartalmazza. Ez alapján a szomszédsági halmazokból a teljes halmaz bejárása nélkül törölhetők az élek.
+        self.in_neighbors: dict[str, dict[str, int | float | ParallelArcs]] = defaultdict(dict)
+        # A gráf minden módosításakor növelt verziószám. Az algoritmusok eredményeit a verziószámmal együtt
+        # tároljuk egy legfeljebb cache_size méretű, LRU elven ürülő gyorsítótárban.
+        self.version = 0
+        self.cache_size = cache_size
+        self.cache_hits = self.cache_misses = 0
+        self._cache: OrderedDict[tuple, object] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # A lekérdezések mérése. Ha None, akkor a mérés ki van kapcsolva, és a lekérdezések költsége
+        # hívásonként egyetlen attribútum vizsgálattal nő.
+        self.instrumentation: Instrumentation | None = None
+        # A csúcsok síkbeli helye, ha ismert (pl. a vásznon). Az A* keresés alapértelmezett heurisztikája
+        # használja, a hozzá tartozó, a gráf verziójához kötött skálázó tényezővel együtt.
+        self.positions: dict[str, tuple[float, float]] = dict()
+        self._heuristic_scale: float | None = None
+        # Az a gráfverzió, amelyre az élsúlyok ellenőrzése utoljára sikeresen lefutott.
+        self._checked_version = -1
+        # Az összefüggő komponensek. Élek felvételekor a halmazok egyesítésével követjük a változást, törléskor
+        # viszont a komponens szétszakadhat, ezért ekkor csak érvénytelennek jelöljük, és a következő
+        # lekérdezéskor építjük újra. Az erősen összefüggő komponensek a gráf egy verziójára érvényesek.
+        self._components = DisjointSets()
+        self._components_dirty = False
+        self._strong_components: tuple[list[list[str]], dict[str, int]] | None = None
+
+    def __getstate__(self):
+        # A zár nem másolható és nem menthető, ezért a tárolt eredményekkel együtt kihagyjuk. A mérés a futó
+        # programhoz kötődik, így azt sem visszük át.
+        state = self.__dict__.copy()
+        del state['_cache_lock']
+        state['_cache'] = OrderedDict()
+        state['instrumentation'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
 
     def __str__(self):
         w = max(len(vname) for vname in self.neighbors)
@@ -26,6 +347,13 @@ class Graph:
 
         return ''.join(graph_string)
 
+    def add_vertex(self, vertex_label: str):
+        """Egy új, élekkel még nem rendelkező csúcsot vesz fel a gráfba, ha az még nem létezik."""
+        if vertex_label not in self.vertices:
+            self.vertices[vertex_label] = Vertex(vertex_label)
+            self._components.add(vertex_label)
+            self._changed()
+
     def add_connection(self, start_vertex_label: str, end_vertex_label: str, weight=1):
         """A megadott kezdő- és végcsúcs közötti élt határozza meg a gráfban.
         Opcionálisan az élhez rendelhető egy súly is.
@@ -37,151 +365,651 @@ class Graph:
         # Felvesszük a szomszédságot leíró szótárba a végcsúcsot, ha az nem létezik még, és amihez
         # rögtön hozzárendelünk egy halmaz konténert.
         self.neighbors[end_vertex_label]
+        # A fordított szomszédsági indexben az él súlyát is nyilvántartjuk.
+        _add_in_arc(self.in_neighbors[end_vertex_label], start_vertex_label, weight)
         # A tényleges csúcs objektumokat is létrehozzuk és eltároljuk, ha még nem léteznek.
         if start_vertex_label not in self.vertices:
             self.vertices.update({start_vertex_label: Vertex(start_vertex_label)})
         if end_vertex_label not in self.vertices:
             self.vertices.update({end_vertex_label: Vertex(end_vertex_label)})
+        if not self._components_dirty:
+            self._components.add(start_vertex_label)
+            self._components.add(end_vertex_label)
+            self._components.union(start_vertex_label, end_vertex_label)
+        self._changed()
+
+    def add_connections(self, connections: Iterable[tuple], directed: bool = True, chunk_size: int = 65536) -> int:
+        """Több élt vesz fel egyszerre a gráfba. Az élek (kezdőcsúcs, végcsúcs) vagy (kezdőcsúcs, végcsúcs, súly)
+        alakú párosok, illetve hármasok. Ha a directed hamis, akkor minden élt mindkét irányban felvesz.
+        Az éleket chunk_size elemű darabokban, darabonként tömegesen dolgozza fel. A felvett élek számát adja
+        vissza.
+        """
+        connections = iter(connections)
+        count = 0
+        while chunk := list(islice(connections, chunk_size)):
+            self._add_arcs([edge if len(edge) == 3 else (edge[0], edge[1], 1) for edge in chunk], directed)
+            count += len(chunk)
+        if count:
+            self._changed()
+        return count
+
+    def _add_arcs(self, edges: list[tuple], directed: bool):
+        """Az élek (kezdőcsúcs, végcsúcs, súly) hármasainak tömeges felvétele. A csúcsokat egyszerre hozza
+        létre, az éleket pedig egyetlen, metódushívások nélküli ciklusban veszi fel a szomszédsági halmazokba és
+        a fordított indexbe.
+        """
+        vertices, neighbors, in_neighbors = self.vertices, self.neighbors, self.in_neighbors
+        # A csúcsokat az élek sorrendjében vesszük fel, ahogy az élenkénti add_connection is tenné.
+        labels = dict.fromkeys(chain.from_iterable(map(itemgetter(0, 1), edges)))
+        new_labels = list(filterfalse(vertices.__contains__, labels))
+        vertices.update(zip(new_labels, map(Vertex, new_labels)))
+        for label in labels:
+            neighbors[label]
+        # Az élek csúcsok szerinti csoportosítása (rendezés és groupby) mérhetően lassabb ennél a ciklusnál: a
+        # rendezett sorrendben az élek a memóriában szétszórva, gyorsítótár-tévesztésekkel érhetők el.
+        arcs = edges if directed else chain(edges, map(itemgetter(1, 0, 2), edges))
+        for start, end, weight in arcs:
+            neighbors[start].add((end, weight))
+            predecessors = in_neighbors[end]
+            # Egyetlen szótárművelet, ha a két csúcs között még nincs él; párhuzamos élnél a súlyok sorozata.
+            if predecessors.setdefault(start, weight) is not weight:
+                _add_in_arc(predecessors, start, weight)
+        # Az összefüggő komponenseket a kis darabok esetén élenként frissítjük. A gráf méretéhez képest nagy
+        # darab után a nyilvántartást csak a következő komponens lekérdezés építi újra, egyszerre az összes
+        # élből, így egy nagy gráf darabonkénti betöltése nem jár élenkénti egyesítéssel.
+        if not self._components_dirty:
+            components = self._components
+            if 4 * len(edges) < len(components.parent):
+                for start, end, _ in edges:
+                    components.add(start)
+                    components.add(end)
+                    components.union(start, end)
+            else:
+                self._components_dirty = True
+
+    @classmethod
+    def from_edge_file(cls, path, directed: bool = True, delimiter: str | None = None, chunk_size: int = 65536,
+                       progress: Callable[[int, int], object] | None = None, encoding: str = 'utf-8') -> 'Graph':
+        """Egy élistát tartalmazó szövegfájlból hozza létre a gráfot.
+        A fájl minden sora egy élt ír le a kezdőcsúcs és a végcsúcs címkéjével, amelyet opcionálisan
+        egy harmadik oszlopban az él súlya követhet. Az oszlopokat a delimiter választja el (alapesetben
+        bármilyen szóköz karakter). Az üres és a # karakterrel kezdődő sorokat figyelmen kívül hagyja.
+        A fájlt chunk_size soronként dolgozza fel, így nem kell a teljes fájlt a memóriában tartani.
+        Minden feldolgozott darab után meghívja a progress függvényt a beolvasott és a teljes bájtszámmal.
+        """
+        graph = cls()
+        for edges in read_edge_file(path, delimiter, chunk_size, progress, encoding):
+            graph.add_connections(edges, directed)
+        return graph
 
     def remove_edge(self, start_vertex_label: str, end_vertex_label: str):
         """A megadott kezdő- és végcsúcs közötti élt eltávolítja."""
-        self.neighbors[start_vertex_label] = set(item for item in self.neighbors[start_vertex_label]
-                                                 if item[0] != end_vertex_label)
+        self._remove_arcs(start_vertex_label, end_vertex_label)
+        self._remove_arcs(end_vertex_label, start_vertex_label)
+        self._components_dirty = True
+        self._changed()
 
-        self.neighbors[end_vertex_label] = set(item for item in self.neighbors[end_vertex_label]
-                                               if item[0] != start_vertex_label)
+    def _remove_arcs(self, start_vertex_label: str, end_vertex_label: str):
+        """A kezdőcsúcsból a végcsúcsba mutató összes (akár különböző súlyú) irányított élt eltávolítja."""
+        predecessors = self.in_neighbors.get(end_vertex_label)
+        if not predecessors or start_vertex_label not in predecessors:
+            return
+        for weight in arc_weights(predecessors.pop(start_vertex_label)):
+            self.neighbors[start_vertex_label].discard((end_vertex_label, weight))
 
     def remove_vertex(self, vertex_label: str):
         """A megadott csúcsot eltávolítja a gráfból."""
         # A csúcs objektumok közül eltávolítjuk a csúcsot.
         self.vertices.pop(vertex_label)
-        # A szomszédságot leíró szótárból eltávolítjuk a megadott csúcsot.
-        self.neighbors.pop(vertex_label)
-        # Minden olyan csúcs esetén, amelynek szomszédja volt, kivesszük a szomszéd csúcsok közül.
-        for vxl, nbs in self.neighbors.items():
-            self.neighbors[vxl] = set(item for item in nbs if item[0] != vertex_label)
+        self.positions.pop(vertex_label, None)
+        # A szomszédságot leíró szótárból eltávolítjuk a megadott csúcsot, és a kimenő éleit.
+        for neighbor_label, weight in self.neighbors.pop(vertex_label, ()):
+            if predecessors := self.in_neighbors.get(neighbor_label):
+                predecessors.pop(vertex_label, None)
+        # Csak azon csúcsok szomszédai közül kell kivenni, amelyekből él vezetett a csúcsba.
+        for predecessor_label, weights in self.in_neighbors.pop(vertex_label, {}).items():
+            if predecessor_label != vertex_label:
+                for weight in arc_weights(weights):
+                    self.neighbors[predecessor_label].discard((vertex_label, weight))
+        self._components_dirty = True
+        self._changed()
+
+    def in_degree(self, vertex_label: str) -> int:
+        """A csúcsba befutó élek száma."""
+        return sum(len(arc_weights(weights)) for weights in self.in_neighbors.get(vertex_label, {}).values())
+
+    def has_edge(self, start_vertex_label: str, end_vertex_label: str) -> bool:
+        """Igaz, ha a kezdőcsúcsból a végcsúcsba vezet (legalább egy) irányított él."""
+        return start_vertex_label in self.in_neighbors.get(end_vertex_label, ())
+
+    @property
+    def edge_count(self) -> int:
+        """Az irányított élek száma. A nem irányított élek mindkét irányban számítanak."""
+        return sum(len(neighbors) for neighbors in self.neighbors.values())
+
+    def predecessors(self, vertex_label: str) -> set[str]:
+        """Azon csúcsok címkéinek halmaza, amelyekből él vezet a megadott csúcsba."""
+        return set(self.in_neighbors.get(vertex_label, ()))
 
     def set_vertex_data(self, vertex_label, vertex_data):
         """Egy adott csúcshoz értéket rendel."""
         if vx := self.vertices.get(vertex_label):
             vx.data = vertex_data
+            self._changed()
+
+    def connected(self, vertex_label1: str, vertex_label2: str) -> bool:
+        """Igaz, ha a két csúcs között van út, az élek irányától eltekintve."""
+        if vertex_label1 not in self.vertices or vertex_label2 not in self.vertices:
+            return False
+        components = self._disjoint_sets()
+        return components.find(vertex_label1) == components.find(vertex_label2)
+
+    def component_of(self, vertex_label: str) -> list[str]:
+        """A csúccsal (az élek irányától eltekintve) összefüggő komponens csúcsainak címkéi.
+        Ha a csúcs nem létezik, akkor üres lista.
+        """
+        if vertex_label not in self.vertices:
+            return []
+        components = self._disjoint_sets()
+        return list(components.members[components.find(vertex_label)])
+
+    def component_size(self, vertex_label: str) -> int:
+        """A csúcsot tartalmazó összefüggő komponens csúcsainak száma. Ha a csúcs nem létezik, akkor 0."""
+        if vertex_label not in self.vertices:
+            return 0
+        components = self._disjoint_sets()
+        return len(components.members[components.find(vertex_label)])
+
+    def components(self) -> list[list[str]]:
+        """A gráf összefüggő komponensei (az élek irányától eltekintve) a csúcscímkék listáiként."""
+        return [list(members) for members in self._disjoint_sets().members.values()]
+
+    def _disjoint_sets(self) -> DisjointSets:
+        """Az összefüggő komponensek naprakész nyilvántartása. Ha csúcs vagy él törlése miatt érvénytelen, vagy
+        nem tartalmaz minden csúcsot, akkor a szomszédsági halmazokból újraépíti. Az új nyilvántartás csak
+        elkészülte után lép a régi helyére, így az egyszerre futó lekérdezések nem zavarják egymást.
+        """
+        components = self._components
+        if self._components_dirty or len(components.parent) != len(self.vertices):
+            components = DisjointSets()
+            for vertex_label in self.vertices:
+                components.add(vertex_label)
+            for vertex_label, neighbors in self.neighbors.items():
+                for neighbor_label, weight in neighbors:
+                    components.union(vertex_label, neighbor_label)
+            self._components, self._components_dirty = components, False
+        return components
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """A gráf erősen összefüggő komponensei: olyan csúcshalmazok, amelyeken belül bármely csúcsból bármely
+        másikba vezet irányított út. A komponenseket Tarjan algoritmusával, a fordított topologikus sorrendjükben
+        adja vissza. Az eredményt a gráf következő módosításáig tárolja.
+        """
+        return [list(component) for component in self._tarjan()[0]]
+
+    def strongly_connected(self, vertex_label1: str, vertex_label2: str) -> bool:
+        """Igaz, ha a két csúcs között mindkét irányban vezet irányított út."""
+        if vertex_label1 not in self.vertices or vertex_label2 not in self.vertices:
+            return False
+        component_index = self._tarjan()[1]
+        return component_index[vertex_label1] == component_index[vertex_label2]
+
+    def _tarjan(self) -> tuple[list[list[str]], dict[str, int]]:
+        """Az erősen összefüggő komponensek listája és a csúcscímke -> komponens sorszáma szótár.
+        A mély gráfokon se fogyjon el a hívási verem, ezért a mélységi bejárást egy explicit veremmel végezzük.
+        """
+        if (strong_components := self._strong_components) is not None:
+            return strong_components
+        neighbors = self.neighbors
+        index, low = dict(), dict()  # A csúcsok elérési sorszáma, és a belőlük elérhető legkisebb sorszám.
+        stack, on_stack = [], set()  # A még komponenshez nem rendelt, bejárt csúcsok.
+        components, component_index = [], dict()
+        for root in self.vertices:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            # A bejárás verme (csúcs, a szomszédai még meg nem vizsgált részének iterátora) párokat tartalmaz.
+            work = [(root, iter(neighbors.get(root, ())))]
+            while work:
+                current, neighbor_iterator = work[-1]
+                for neighbor, weight in neighbor_iterator:
+                    if neighbor not in index:
+                        index[neighbor] = low[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(neighbors.get(neighbor, ()))))
+                        break
+                    if neighbor in on_stack:
+                        low[current] = min(low[current], index[neighbor])
+                else:
+                    # A csúcs minden szomszédját megvizsgáltuk: visszalépünk.
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[current])
+                    if low[current] == index[current]:
+                        # A csúcs egy komponens gyökere: a verem felette levő csúcsai alkotják a komponenst.
+                        component = []
+                        while True:
+                            vertex_label = stack.pop()
+                            on_stack.discard(vertex_label)
+                            component_index[vertex_label] = len(components)
+                            component.append(vertex_label)
+                            if vertex_label == current:
+                                break
+                        components.append(component)
+        self._strong_components = components, component_index
+        return self._strong_components
+
+    def set_vertex_position(self, vertex_label: str, x: float, y: float):
+        """A csúcs síkbeli helyét rögzíti, amit az A* keresés alapértelmezett heurisztikája használ.
+        A hely nem része a gráf szerkezetének, ezért a módosítása nem érvényteleníti a tárolt eredményeket.
+        """
+        if vertex_label in self.vertices:
+            self.positions[vertex_label] = (x, y)
+            self._heuristic_scale = None
+
+    def enable_instrumentation(self, instrumentation: Instrumentation | None = None) -> Instrumentation:
+        """Bekapcsolja a lekérdezések mérését, és visszaadja a mérést végző objektumot. Ebbe lehet további
+        függvényeket felvenni a hooks listába, amelyek minden mért lekérdezés után megkapják az adatokat.
+        Egy meglevő Instrumentation példány is megadható, így több gráf mérési adatai egy helyre futhatnak.
+        A gráfról a freeze metódussal készült tömör nézetek is ugyanezt a mérést használják.
+        """
+        if instrumentation is None:
+            instrumentation = self.instrumentation or Instrumentation()
+        self.instrumentation = instrumentation
+        return instrumentation
+
+    def disable_instrumentation(self):
+        """Kikapcsolja a lekérdezések mérését."""
+        self.instrumentation = None
+
+    @property
+    def last_stats(self) -> QueryStats | None:
+        """A legutóbbi mért lekérdezés adatai. Ha a mérés ki van kapcsolva, akkor None."""
+        return self.instrumentation.last_stats if self.instrumentation is not None else None
+
+    def _changed(self):
+        """A gráf módosulását jelzi: új verziószámot kap, és a korábbi verziókhoz tartozó tárolt
+        eredmények érvényüket vesztik.
+        """
+        self.version += 1
+        with self._cache_lock:
+            self._cache.clear()
+        self._heuristic_scale = None
+        self._strong_components = None
+
+    def clear_cache(self):
+        """Kiüríti az algoritmusok eredményeit tároló gyorsítótárat, és nullázza a számlálóit."""
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = self.cache_misses = 0
+
+    def _cache_lookup(self, key: tuple):
+        """Visszaadja a kulcshoz tárolt eredményt, és azt a legutóbb használtnak jelöli. Ha nincs ilyen,
+        akkor KeyError kivétel keletkezik. Nem hashelhető kulcs esetén TypeError kivétel keletkezik.
+        """
+        with self._cache_lock:
+            hit = key in self._cache
+            if hit:
+                self._cache.move_to_end(key)
+                result = self._cache[key]
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        if self.instrumentation is not None and (stats := self.instrumentation.current()) is not None:
+            stats.counters['cache_hits' if hit else 'cache_misses'] += 1
+        if not hit:
+            raise KeyError(key)
+        return result
+
+    def _cache_store(self, key: tuple, result):
+        """Eltárolja az eredményt, ha az a gráf aktuális verziójára vonatkozik. Ha a gyorsítótár
+        megtelt, akkor a legrégebben használt eredményt törli.
+        """
+        with self._cache_lock:
+            if key[-1] != self.version:
+                return
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     @staticmethod
-    def check_edge_weight_values(fn):
-        def inner(self, start_vertex_label: str):
-            # Ellenőrizni kell, hogy minden élsúly szám-e, és nem negatív.
+    def cached_query(fn):
+        """Az algoritmus eredményét az (algoritmus, argumentumok, gráfverzió) kulcs alapján tárolja, így
+        a változatlan gráfon megismételt lekérdezés azonnal visszatér. Generátorfüggvény esetén a kiadott
+        elemeket csak akkor tárolja, ha a bejárás végigért.
+        """
+        def recording(self, key, iterator):
+            items = []
+            for item in iterator:
+                items.append(item)
+                yield item
+            self._cache_store(key, items)
+
+        @wraps(fn)
+        def inner(self, *args, **kwargs):
+            if not self.cache_size:
+                return fn(self, *args, **kwargs)
+            key = (fn.__name__, args, tuple(kwargs.items()), self.version)
             try:
-                for vertex_label, neightbor_set in self.neighbors.items():
-                    for neighbor_label, edge_distance_to_neighbor in neightbor_set:
-                        # Ha a konverzió nem lehetséges, akkor az azt jelenti, hogy a súly nem szám, vagy
-                        # számnak nem tekinthető karaktersorozat a súly. Ekkor típushibát jelző kivétel dobódik.
-                        weight_num = float(edge_distance_to_neighbor)
-                        # Ha ugyan a súly szám, de negatív, akkor ezt jelző kivétel keletkezik.
-                        if weight_num < 0:
-                            raise ValueError('Minden élsúly nem negatív valós szám kell, hogy legyen')
-            except (TypeError, ValueError):
-                raise TypeError(
-                    f'{vertex_label}-{neighbor_label} csúcsok közötti él súlya:{edge_distance_to_neighbor}. '
-                    f'Minden él súlyának valós számnak kell lenni.')
-
-            return fn(self, start_vertex_label)
+                result = self._cache_lookup(key)
+            except TypeError:
+                return fn(self, *args, **kwargs)
+            except KeyError:
+                result = fn(self, *args, **kwargs)
+                if isgenerator(result):
+                    return recording(self, key, result)
+                self._cache_store(key, result.copy() if isinstance(result, list) else result)
+                return result
+            if isgeneratorfunction(fn):
+                return iter(result)
+            return result.copy() if isinstance(result, list) else result
+
+        return inner
+
+    @staticmethod
+    def instrumented_query(fn):
+        """Ha a gráfon be van kapcsolva a mérés, akkor a lekérdezés futását méri (lásd Instrumentation)."""
+        @wraps(fn)
+        def inner(self, *args, **kwargs):
+            if self.instrumentation is None:
+                return fn(self, *args, **kwargs)
+            return self.instrumentation.call(fn, self, args, kwargs)
+
+        return inner
+
+    def _check_edge_weight_values(self):
+        """Ellenőrzi, hogy minden élsúly szám-e, és nem negatív. Ha nem, akkor TypeError kivételt dob."""
+        try:
+            for vertex_label, neightbor_set in self.neighbors.items():
+                for neighbor_label, edge_distance_to_neighbor in neightbor_set:
+                    # Ha a konverzió nem lehetséges, akkor az azt jelenti, hogy a súly nem szám, vagy
+                    # számnak nem tekinthető karaktersorozat a súly. Ekkor típushibát jelző kivétel dobódik.
+                    weight_num = float(edge_distance_to_neighbor)
+                    # Ha ugyan a súly szám, de negatív, akkor ezt jelző kivétel keletkezik.
+                    if weight_num < 0:
+                        raise ValueError('Minden élsúly nem negatív valós szám kell, hogy legyen')
+        except (TypeError, ValueError):
+            raise TypeError(
+                f'{vertex_label}-{neighbor_label} csúcsok közötti él súlya:{edge_distance_to_neighbor}. '
+                f'Minden él súlyának valós számnak kell lenni.')
+        self._checked_version = self.version
+
+    @staticmethod
+    def check_edge_weight_values(fn):
+        @wraps(fn)
+        def inner(self, start_vertex_label: str, *args, **kwargs):
+            # Ellenőrizni kell, hogy minden élsúly szám-e, és nem negatív. A változatlan gráfon ezt nem kell
+            # megismételni, így a két csúcs közötti keresések nem az élek számával arányos idővel indulnak.
+            if self._checked_version != self.version:
+                self._check_edge_weight_values()
+            if self.instrumentation is not None and (stats := self.instrumentation.current()) is not None:
+                stats.lap('validation')
+
+            return fn(self, start_vertex_label, *args, **kwargs)
 
         return inner
 
+    @instrumented_query
+    @cached_query
+    @check_edge_weight_values
+    def shortest_paths(self, start_vertex_label: str, target: str | None = None) -> 'ShortestPaths':
+        """Visszaadja a megadott csúcstól számított legrövidebb úthosszakat és a legrövidebb utakat.
+        Az eredmény szótárként használható: kulcsai az elérhető célcsúcsok címkéi, értékei pedig a
+        (legrövidebb úthossz, legrövidebb útvonal csúcsainak listája) párosok. Az útvonalat csak akkor állítja
+        elő, amikor azt egy adott célcsúcsra lekérdezik.
+        Ha a target célcsúcs meg van adva, akkor a keresés leáll, amint ennek a csúcsnak a legrövidebb
+        úthossza véglegessé vált.
+        """
+        if start_vertex_label not in self.vertices:
+            return ShortestPaths(start_vertex_label, {}, {})
+
+        # Az egyenlő úthosszú csúcsok közül mindig a gráfba korábban felvett csúcsot vesszük előbb, így az
+        # eredmény megegyezik azzal, mintha a még nem látogatott csúcsok közül sorban keresnénk a minimumot.
+        rank = {label: i for i, label in enumerate(self.vertices)}
+        # Mérés esetén a prioritási sorba tett elemeket és a megvizsgált éleket is számláljuk.
+        stats = self.instrumentation.current() if self.instrumentation is not None else None
+        push = heappush if stats is None else stats.counting(heappush, 'queue_pushes')
+        out_arcs = self.neighbors.get if stats is None else stats.counting_items(self.neighbors.get, 'edges_relaxed')
+        # A kiinduló csúcsok eddig ismert legrövidebb úthosszai. Aki nem szerepel benne, az végtelen távra van.
+        tentative = {start_vertex_label: 0}
+        # A véglegessé vált legrövidebb úthosszak, és a legrövidebb úton az adott csúcsot megelőző csúcs.
+        distances = {}
+        predecessors = {start_vertex_label: None}
+        # Prioritási sor (bináris kupac) a (úthossz, sorrend, címke) hármasokkal. Egy csúcs többször is
+        # bekerülhet, az elavult bejegyzéseket kivételkor egyszerűen átugorjuk (lusta törlés).
+        heap = [(0, rank[start_vertex_label], start_vertex_label)]
+
+        while heap:
+            distance, _, current = heappop(heap)
+            if current in distances:
+                continue
+            distances[current] = distance
+            if current == target:
+                break
+            # Az aktuális csúcs még nem végleges szomszédainak úthosszát csökkentjük, ha rövidebb utat találtunk.
+            for neighbor, edge_distance_to_neighbor in out_arcs(current, ()):
+                if neighbor in distances:
+                    continue
+                new_distance = distance + float(edge_distance_to_neighbor)
+                if new_distance < tentative.get(neighbor, inf):
+                    tentative[neighbor] = new_distance
+                    predecessors[neighbor] = current
+                    push(heap, (new_distance, rank[neighbor], neighbor))
+
+        if stats is not None:
+            stats.lap('search')
+            stats.count_search(len(distances))
+        # A véglegessé vált csúcsokat a gráfba való felvételük sorrendjébe rendezzük.
+        distances = {label: distances[label] for label in sorted(distances, key=rank.__getitem__)}
+        result = ShortestPaths(start_vertex_label, distances, predecessors)
+        if stats is not None:
+            stats.lap('reconstruction')
+        return result
+
+    @instrumented_query
     @check_edge_weight_values
-    def shortest_paths(self, start_vertex_label: str):
-        """Visszaadja egy szótárban a megadott csúcstól számított legrövidebb út hosszát, valamint az
-        összes csúcshoz vezető legrövidebb útvonalat.
+    def shortest_path(self, start_vertex_label: str, target_vertex_label: str, method: str = 'astar',
+                      heuristic: Callable[[str], float] | None = None) -> tuple[int | float, list[str]]:
+        """Két csúcs közötti legrövidebb út hosszát és az út csúcsainak listáját adja vissza. Ha a célcsúcs
+        nem érhető el, akkor (végtelen, üres lista) az eredmény. A keresés leáll, amint a célcsúcs legrövidebb
+        úthossza véglegessé vált, így nem kell az összes csúcs távolságát kiszámítani.
+        A method értéke:
+        - 'astar': A* keresés, amely a heuristic(csúcscímke) becslés szerint a célcsúcshoz közelebbi csúcsokat
+          veszi előbb sorra. A becslés nem lehet nagyobb a célcsúcsig vezető legrövidebb út hosszánál, és minden
+          (u, v) élre h(u) <= w(u, v) + h(v) kell, hogy teljesüljön. Alapértelmezés szerint a csúcsok helyének
+          (lásd set_vertex_position) euklideszi távolsága, ami ezeket teljesíti (lásd euclidean_heuristic).
+        - 'bidirectional': kétirányú Dijkstra keresés, amely a kezdőcsúcsból előre, a célcsúcsból pedig a
+          fordított éleken visszafelé halad, amíg a két keresés össze nem ér.
         """
-        # Minden kiinduló ponttól számított, eddig ismert legrövidebb úthosszat minden csúcsra végtelenre
-        # állítjuk, hiszen ezeket kezdetben nem ismerjük még.
-        for vertex_label in self.vertices:
-            self.set_vertex_data(vertex_label, [float('inf'), None])
-        # A kiinduló csúcs eddig ismert legrövidebb úthosszát 0-ra állítjuk, hiszen önmagától nulla távra van.
-        self.set_vertex_data(start_vertex_label, [0, None])
+        if method == 'astar':
+            return self._astar(start_vertex_label, target_vertex_label, heuristic)
+        if method == 'bidirectional':
+            return self._bidirectional_dijkstra(start_vertex_label, target_vertex_label)
+        raise ValueError(f'Ismeretlen keresési módszer: {method}')
 
-        # Minden csúcsot még nem vizsgáltnak (nem látogatottnak) állítjuk be.
-        unvisited: dict = {label: vertex for label, vertex in self.vertices.items()}
+    def euclidean_heuristic(self, target_vertex_label: str) -> Callable[[str], float] | None:
+        """A célcsúcstól mért euklideszi távolságon alapuló becslés az A* kereséshez. A távolságot az élek
+        súlyának és hosszának legkisebb arányával szorozza, így a becslés sosem nagyobb a valódi úthossznál.
+        Ha nem minden csúcsnak ismert a helye, akkor None, mert ekkor ez nem garantálható.
+        """
+        positions = self.positions
+        if target_vertex_label not in positions or len(positions) < len(self.vertices):
+            return None
+        if self._heuristic_scale is None:
+            scale = inf
+            for start_vertex_label, neighbors in self.neighbors.items():
+                x0, y0 = positions[start_vertex_label]
+                for end_vertex_label, weight in neighbors:
+                    x1, y1 = positions[end_vertex_label]
+                    if length := hypot(x1 - x0, y1 - y0):
+                        scale = min(scale, float(weight) / length)
+            # Ha nincs pozitív hosszú él, akkor minden elérhető csúcs ugyanott van, és a becslés 0.
+            self._heuristic_scale = scale if scale != inf else 0.0
+        scale = self._heuristic_scale
+        target_x, target_y = positions[target_vertex_label]
+        return lambda vertex_label: scale * hypot(positions[vertex_label][0] - target_x,
+                                                  positions[vertex_label][1] - target_y)
 
-        while unvisited:
-            # Egy olyan új aktuális vizsgálni kivánt csúcsot választunk a még nem látogatott csúcsok közül, amely
-            # ezek közül a legrövidebb útvonallal rendelkezik.
-            current = min(unvisited, key=lambda lbl: unvisited[lbl].data[0])
-
-            # Az aktuális csúcsra kiszámítjuk a távolságot az összes nem látogatott szomszédjától.
-            for neighbor, edge_distance_to_neighbor in self.neighbors[current]:
-                if neighbor in unvisited:
-                    neighbor_vertex_obj = self.vertices[neighbor]
-                    # Ha a szomszéd csúcs eddig ismert legrövidebb úthossza nagyobb, mint a jelenlegi csúcs
-                    # eddig ismert legrövidebb úthossza + a közöttük levő út hossza, akkor a szomszéd csúcs eddig
-                    # ismert legrövidebb úthosszát erre az összegre módosítjuk.
-                    if (distance := self.vertices[current].data[0] + float(edge_distance_to_neighbor)) < \
-                            neighbor_vertex_obj.data[0]:
-                        neighbor_vertex_obj.data = [distance, current]
-            # Miután az aktuális csúcs minden szomszédját megvizsgáltuk és aktulizáltuk a szomszéd legrövidebb
-            # távolság adatát és az odavezető megelőző csúcsot, az aktuális csúcsot megvizsgáltnak tekintjük és
-            # kivesszük a még meg nem látogatottak listájából.
-            unvisited.pop(current)
-
-        # Segédfüggvény
-        def shortest_path(end_vertex_label: str):
-            """A start_vertex-től az argumentumként megadott végcsúcshoz vezető legrövidebb úton levő csúcsok
-            listáját adja vissza a csúcsok adatai alapján.
-            """
-            path = []
-            path.append(end_vertex_label)
-            while previous_vertex := self.vertices[end_vertex_label].data[1]:
-                path.append(previous_vertex)
-                end_vertex_label = previous_vertex
-            return path[-1::-1]
-
-        # A visszatérési értékként szolgáló szótár előállítása, amelynek kulcsai a célcsúcsok címkéi, az
-        # ezekhez tartozó értékek olyan tuple konténerek, amelyek első eleme a célcsúcsig vezető legrövidebb
-        # út hossza, második eleme pedig a legrövidebb útat jelentő csúcsok listája.
-        shortest_distances_and_paths = {vx_label: (self.vertices[vx_label].data[0], shortest_path(vx_label))
-                                        for vx_label in self.vertices
-                                        if self.vertices[vx_label].data[0] != float('inf')}
-
-        return shortest_distances_and_paths
-
-    def breadth_first_traversal(self, start_vertex_label: str) -> list[str]:
-        visited = []  # A már bejárt (megvizsgált, feldolgozott) csúcsok listája.
-        # A vizsgálatra váró csúcsok listája, ami kezdetben csak a kiinduló csúcsot tartalmazza.
-        unvisited = [start_vertex_label]
-        while unvisited:
-            # A vizsgálatra váró csúcsok listájából vesszük a soron következőt.
-            current = unvisited.pop(0)
-            if current not in visited:
-                # Ha az aktuálisan vizsgált csúcs nincs a meglátogatottak között, akkor felvesszük ezek listájába.
-                visited.append(current)
-                # Összegyűjtjük az aktuálisan vizsgált csúcs szomszédait.
-                neighbours = [neighbour for neighbour, weight in self.neighbors[current]]
-                # Kiválogatjuk a szomszédok közül a még nem vizsgáltakat.
-                unvisited_neighbours = [neighbour for neighbour in neighbours if neighbour not in visited]
-                # Ezeket hozzáadjuk a vizsgálatra váró csúcsok listájához.
-                unvisited.extend(unvisited_neighbours)
-        return visited
+    def _astar(self, start_vertex_label: str, target_vertex_label: str,
+               heuristic: Callable[[str], float] | None) -> tuple[int | float, list[str]]:
+        if start_vertex_label not in self.vertices or target_vertex_label not in self.vertices:
+            return inf, []
+        if heuristic is None:
+            heuristic = self.euclidean_heuristic(target_vertex_label) or (lambda vertex_label: 0)
+        stats = self.instrumentation.current() if self.instrumentation is not None else None
+        push = heappush if stats is None else stats.counting(heappush, 'queue_pushes')
+        out_arcs = self.neighbors.get if stats is None else stats.counting_items(self.neighbors.get, 'edges_relaxed')
+        tentative = {start_vertex_label: 0}
+        predecessors = {start_vertex_label: None}
+        settled = set()
+        # A kupac elemei (úthossz + becslés, sorszám, címke) hármasok. Az egyenlő értékű elemek közül a
+        # korábban betett kerül előbb sorra.
+        sequence = 0
+        heap = [(heuristic(start_vertex_label), sequence, start_vertex_label)]
+        while heap:
+            _, _, current = heappop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
+            if current == target_vertex_label:
+                break
+            distance = tentative[current]
+            for neighbor, edge_distance_to_neighbor in out_arcs(current, ()):
+                if neighbor in settled:
+                    continue
+                new_distance = distance + float(edge_distance_to_neighbor)
+                if new_distance < tentative.get(neighbor, inf):
+                    tentative[neighbor] = new_distance
+                    predecessors[neighbor] = current
+                    sequence += 1
+                    push(heap, (new_distance + heuristic(neighbor), sequence, neighbor))
 
-    def breadth_first_iterator(self, start_vertex_label: str) -> 'Generátor-iterátor[Vertex]':
-        visited = set()  # A már bejárt (megvizsgált, feldolgozott) csúcsok halmaza.
-        # A vizsgálatra váró csúcsok listája, ami kezdetben csak a kiinduló csúcsot tartalmazza.
-        unvisited = [start_vertex_label]
-        for vx in self.vertices.values():
-            vx.data = 0
+        if stats is not None:
+            stats.lap('search')
+            stats.count_search(len(settled))
+        if target_vertex_label not in settled:
+            return inf, []
+        result = ShortestPaths(start_vertex_label, {target_vertex_label: tentative[target_vertex_label]},
+                               predecessors)[target_vertex_label]
+        if stats is not None:
+            stats.lap('reconstruction')
+        return result
+
+    def _bidirectional_dijkstra(self, start_vertex_label: str,
+                                target_vertex_label: str) -> tuple[int | float, list[str]]:
+        if start_vertex_label not in self.vertices or target_vertex_label not in self.vertices:
+            return inf, []
+        stats = self.instrumentation.current() if self.instrumentation is not None else None
+        push = heappush if stats is None else stats.counting(heappush, 'queue_pushes')
+        out_arcs, in_arcs = self.neighbors.get, self.in_neighbors.get
+        if stats is not None:
+            out_arcs, in_arcs = (stats.counting_items(out_arcs, 'edges_relaxed'),
+                                 stats.counting_items(in_arcs, 'edges_relaxed'))
+
+        def reverse_arcs(vertex_label):
+            # A csúcsba befutó élek (kezdőcsúcs, legkisebb súly) párjai.
+            return ((predecessor_label, min(map(float, arc_weights(weights))))
+                    for predecessor_label, weights in in_arcs(vertex_label, {}).items())
+
+        # Mindkét irányhoz: ismert úthosszak, az úton megelőző (visszafelé a rákövetkező) csúcsok, a véglegessé
+        # vált csúcsok halmaza és a (úthossz, sorszám, címke) hármasok kupaca.
+        forward = ({start_vertex_label: 0}, {start_vertex_label: None}, set(), [(0, 0, start_vertex_label)])
+        backward = ({target_vertex_label: 0}, {target_vertex_label: None}, set(), [(0, 0, target_vertex_label)])
+        # Az eddig talált legrövidebb út hossza és az a csúcs, ahol a két irány keresése összeért.
+        best, meeting = (0, start_vertex_label) if start_vertex_label == target_vertex_label else (inf, None)
+        sequence = 0
+        while forward[3] and backward[3]:
+            # Ha a két kupac legkisebb elemének összege nem kisebb az eddig talált útnál, akkor nincs rövidebb út.
+            if forward[3][0][0] + backward[3][0][0] >= best:
+                break
+            # Mindig a kisebb kupacú irányban lépünk tovább.
+            is_forward = len(forward[3]) <= len(backward[3])
+            (tentative, links, settled, heap), other_tentative = \
+                (forward, backward[0]) if is_forward else (backward, forward[0])
+            distance, _, current = heappop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
+            for neighbor, edge_distance_to_neighbor in out_arcs(current, ()) if is_forward \
+                    else reverse_arcs(current):
+                if neighbor in settled:
+                    continue
+                new_distance = distance + float(edge_distance_to_neighbor)
+                if new_distance < tentative.get(neighbor, inf):
+                    tentative[neighbor] = new_distance
+                    links[neighbor] = current
+                    sequence += 1
+                    push(heap, (new_distance, sequence, neighbor))
+                    # Ha a másik irány keresése már elérte ezt a csúcsot, akkor találtunk egy utat.
+                    if neighbor in other_tentative and new_distance + other_tentative[neighbor] < best:
+                        best, meeting = new_distance + other_tentative[neighbor], neighbor
+
+        if stats is not None:
+            stats.lap('search')
+            stats.count_search(len(forward[2]) + len(backward[2]))
+            stats.counters['queue_pushes'] += 1  # A célcsúcs kezdeti bejegyzése a fordított irányban.
+        if meeting is None:
+            return inf, []
+        # Az út a kezdőcsúcstól a találkozási pontig előre, onnan a célcsúcsig a visszafelé keresés szerint halad.
+        path = ShortestPaths(start_vertex_label, {meeting: best}, forward[1]).path(meeting)
+        while (next_vertex := backward[1][path[-1]]) is not None:
+            path.append(next_vertex)
+        if stats is not None:
+            stats.lap('reconstruction')
+        return best, path
+
+    def breadth_first_levels(self, start_vertex_labels: str | Iterable[str],
+                             max_depth: int | None = None) -> Iterator[tuple[int, list[str]]]:
+        """Szintenként haladó szélességi bejárás egy vagy több kiinduló csúcsból.
+        Minden lépésben egy (mélység, csúcscímkék listája) párost ad ki, ahol a lista a kiinduló csúcsoktól
+        pontosan ilyen mélységben (élszámra) levő, korábban még nem érintett csúcsokat tartalmazza.
+        A kiinduló csúcsok a 0 mélységű szintet alkotják. Ha a max_depth meg van adva, akkor az ennél mélyebb
+        szinteket már nem számítja ki, így a k lépésben elérhető szomszédság lekérdezése korán leáll.
+        """
+        if isinstance(start_vertex_labels, str):
+            start_vertex_labels = (start_vertex_labels,)
+        neighbors = self.neighbors
+        # A vizsgálatra váró csúcsok FIFO sora, ami kezdetben a kiinduló csúcsokat tartalmazza. Az ismétlődő
+        # kiinduló csúcsokat csak egyszer vesszük figyelembe.
+        unvisited = deque(dict.fromkeys(start_vertex_labels))
+        visited = set(unvisited)  # A már elért csúcsok halmaza.
+        depth = 0
         while unvisited:
-            current = unvisited.pop(0)
-            if current not in visited:
-                # Ha az aktuálisan vizsgált csúcs nincs a meglátogatottak között, akkor felvesszük ezek halmazába.
-                visited.add(current)
-                # Kiadjuk a csúcsobjektumot.
-                yield self.vertices.get(current)
-                neighbours = [neighbour for neighbour, weight in self.neighbors[current]]
-                unvisited_neighbours = [neighbour for neighbour in neighbours if neighbour not in visited]
-                unvisited.extend(unvisited_neighbours)
+            # A sorban levő csúcsok alkotják az aktuális szintet.
+            frontier = [unvisited.popleft() for _ in range(len(unvisited))]
+            yield depth, frontier
+            if max_depth is not None and depth >= max_depth:
+                return
+            # A következő szint a jelenlegi szint csúcsainak még el nem ért szomszédaiból áll.
+            for current in frontier:
+                for neighbour, weight in neighbors.get(current, ()):
+                    if neighbour not in visited:
+                        visited.add(neighbour)
+                        unvisited.append(neighbour)
+            depth += 1
 
-                for nb in unvisited_neighbours:
-                    self.vertices.get(nb).data = self.vertices.get(current).data + 1
+    @instrumented_query
+    @cached_query
+    def breadth_first_traversal(self, start_vertex_label: str, max_depth: int | None = None) -> list[str]:
+        """A megadott csúcstól kezdődő szélességi bejárás sorrendjében adja vissza a csúcsok címkéit."""
+        return [vertex_label for depth, frontier in self.breadth_first_levels(start_vertex_label, max_depth)
+                for vertex_label in frontier]
 
+    @instrumented_query
+    @cached_query
+    def breadth_first_iterator(self, start_vertex_label: str,
+                               max_depth: int | None = None) -> 'Generátor-iterátor[Vertex]':
+        for depth, frontier in self.breadth_first_levels(start_vertex_label, max_depth):
+            for vertex_label in frontier:
+                # Kiadjuk a csúcsobjektumot.
+                yield self.vertices.get(vertex_label)
+
+    @instrumented_query
+    @cached_query
     def depth_first_iterator(self, start_vertex_label: str) -> 'Generátor-iterátor[Vertex]':
         visited = set()  # A már bejárt (megvizsgált, feldolgozott) csúcsok halmaza.
         # A vizsgálatra váró csúcsok listája, ami kezdetben csak a kiinduló csúcsot tartalmazza.
@@ -195,7 +1023,7 @@ class Graph:
                 # Kiadjuk a csúcsobjektumot.
                 yield self.vertices.get(current)
 
-                neighbours = [neighbour for neighbour, weight in self.neighbors[current]]
+                neighbours = [neighbour for neighbour, weight in self.neighbors.get(current, ())]
                 unvisited_neighbours = [neighbour for neighbour in neighbours if neighbour not in visited]
                 unvisited.extend(unvisited_neighbours)
 
@@ -204,4 +1032,564 @@ class Graph:
                               depth_first=self.depth_first_iterator)
         return algo_iterators.get(algo)(start_vertex_label)
 
+    @check_edge_weight_values
+    def shortest_paths_many(self, start_vertex_labels: Iterable[str], workers: int | None = None,
+                            matrix: bool = False):
+        """Több kiinduló csúcsból számítja a legrövidebb utakat, opcionálisan több folyamatban párhuzamosan.
+        A számítás a gráf tömör pillanatképén fut (lásd CompactGraph.shortest_paths_many), így a gráf
+        közben nem változik meg, és a munkafolyamatoknak csak egyszer kell átadni.
+        """
+        return self.freeze().shortest_paths_many(start_vertex_labels, workers, matrix)
+
+    def freeze(self) -> 'CompactGraph':
+        """A gráf aktuális állapotáról egy tömör, nem módosítható pillanatképet készít, amelyen a bejárások és
+        a legrövidebb utak számítása tömbökön, egész indexekkel fut. A nézet a gráf mérését (lásd
+        enable_instrumentation) is átveszi.
+        """
+        compact_graph = CompactGraph.from_graph(self)
+        compact_graph.instrumentation = self.instrumentation
+        return compact_graph
+
+    def save(self, path, coords: Mapping[str, tuple[float, float]] | None = None):
+        """A gráfot bináris pillanatkép fájlba menti, opcionálisan a csúcsok (x, y) koordinátáival együtt.
+        Ha a coords nincs megadva, akkor a csúcsok rögzített helyét (lásd set_vertex_position) menti, ha van ilyen.
+        """
+        self.freeze().save(path, coords if coords is not None else self.positions or None)
+
+    @classmethod
+    def load(cls, path) -> 'Graph':
+        """Bináris pillanatkép fájlból szerkeszthető gráfot hoz létre. Ha csak lekérdezésekre van szükség,
+        akkor a CompactGraph.load közvetlenül a memóriába leképezett fájlon dolgozik.
+        """
+        return CompactGraph.load(path).to_graph()
+
+
+def read_edge_file(path, delimiter: str | None = None, chunk_size: int = 65536,
+                   progress: Callable[[int, int], object] | None = None,
+                   encoding: str = 'utf-8') -> Iterator[list[tuple]]:
+    """Egy élistát tartalmazó szövegfájl éleit adja ki legfeljebb chunk_size elemű listákban.
+    Az élek (kezdőcsúcs, végcsúcs) vagy (kezdőcsúcs, végcsúcs, súly) alakúak. A súly egész szám, ha annak
+    értelmezhető, egyébként valós szám. Minden darab után meghívja a progress függvényt (ha meg van adva)
+    a már beolvasott és a fájl teljes bájtszámával.
+    """
+    with open(path, 'rb') as file:
+        total_bytes = fstat(file.fileno()).st_size
+        bytes_read = 0
+        line_number = 0
+        while lines := list(islice(file, chunk_size)):
+            edges = []
+            for line in lines:
+                line_number += 1
+                bytes_read += len(line)
+                fields = line.decode(encoding).split(delimiter)
+                if not fields or not fields[0].strip() or fields[0].lstrip().startswith('#'):
+                    continue
+                fields = [field.strip() for field in fields]
+                if len(fields) == 2:
+                    edges.append((fields[0], fields[1]))
+                elif len(fields) == 3:
+                    edges.append((fields[0], fields[1], _parse_weight(fields[2], line_number)))
+                else:
+                    raise ValueError(f'{line_number}. sor: egy élt két vagy három oszlop írhat le, '
+                                     f'nem {len(fields)}.')
+            yield edges
+            if progress is not None:
+                progress(bytes_read, total_bytes)
+
+
+def _file_identity(stat_result) -> tuple[int, int, int, int]:
+    """Egy fájl azonosítója az állapota alapján: a helyben módosított vagy lecserélt fájlé eltér."""
+    return stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns
+
+
+def _as_array(data) -> array:
+    """A (leképezett fájlra mutató) tömbnézet másolata array tömbként, ami a fájltól függetlenül menthető."""
+    return data if isinstance(data, array) else array(data.format, data.tobytes())
+
+
+def _parse_weight(text: str, line_number: int) -> int | float:
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f'{line_number}. sor: az él súlya ({text}) nem szám.') from None
+
+
+class _LabelTable(Sequence):
+    """Egy pillanatkép fájl címketáblája. A címkéket csak az adott indexű elem lekérésekor dekódolja."""
+
+    def __init__(self, label_offsets, label_bytes):
+        self._offsets = label_offsets
+        self._bytes = label_bytes
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return str(self._bytes[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+
+def _array_typecode(values) -> str:
+    """A tömb vagy memórianézet elemtípusának kódja."""
+    return values.typecode if isinstance(values, array) else values.format
+
+
+# A bináris pillanatkép fájl fejléce: azonosító, formátumverzió, a súlyok típuskódja, jelzők, a csúcsok és
+# az élek száma, valamint a címkék bájtjainak összhossza.
+_SNAPSHOT_HEADER = struct.Struct('<4sBBBxqqq')
+_SNAPSHOT_MAGIC = b'GRPH'
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HAS_COORDS = 1
+_SNAPSHOT_BIG_ENDIAN = 2
+
+
+class CompactGraph:
+    """Egy gráf tömör, nem módosítható (fagyasztott) nézete.
+    A csúcscímkéket 0-tól kezdődő, folytonos egész indexekre képezi le, a szomszédságot pedig három tömbben
+    tárolja (CSR formátum): az i indexű csúcs kimenő éleinek célcsúcsai a targets[offsets[i]:offsets[i + 1]]
+    szeletben, az élek súlyai pedig a weights tömb ugyanezen szeletében vannak. Az algoritmusok az indexeken
+    dolgoznak, a címkékre csak az eredmény előállításakor fordítjuk vissza az indexeket.
+    """
+    # A megszakítható keresések ennyi véglegessé vált csúcsonként vizsgálják, hogy megszakították-e őket.
+    cancel_interval = 1024
+
+    def __init__(self, labels: Sequence[str], offsets, targets, weights, coords=None):
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        # A csúcsok síkbeli koordinátái (x0, y0, x1, y1, ...) sorrendben, ha ismertek.
+        self.coords = coords
+        self._min_weight = None
+        # A lekérdezések mérése, lásd Graph.enable_instrumentation.
+        self.instrumentation: Instrumentation | None = None
+        # Ha a nézet egy pillanatkép fájlra leképezett tartalma, akkor a fájl elérési útja, és a fájlnak a
+        # betöltéskori azonosítója (lásd _file_identity).
+        self._path = None
+        self._file_identity = None
+
+    @cached_property
+    def index(self) -> dict[str, int]:
+        """A csúcscímkéket az indexükre képező szótár. Csak az első használatkor épül fel."""
+        return {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CompactGraph':
+        """Egy Graph példány aktuális állapotából készít tömör nézetet."""
+        labels = list(graph.vertices)
+        labels.extend(label for label in graph.neighbors if label not in graph.vertices)
+        index = {label: i for i, label in enumerate(labels)}
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = []
+        for label in labels:
+            for neighbor_label, weight in graph.neighbors.get(label, ()):
+                targets.append(index[neighbor_label])
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        return cls(labels, offsets, targets, cls._weight_array(weights))
+
+    @staticmethod
+    def _weight_array(weights: list) -> array:
+        """Az élsúlyokból egész vagy lebegőpontos tömböt készít attól függően, hogy minden súly egész-e."""
+        if all(type(weight) is int for weight in weights):
+            try:
+                return array('q', weights)
+            except OverflowError:
+                pass
+        try:
+            return array('d', map(float, weights))
+        except (TypeError, ValueError):
+            raise TypeError('Minden él súlyának valós számnak kell lenni.')
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(vertices={len(self)}, edges={self.edge_count})'
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def neighbors(self, vertex_label: str) -> list[tuple[str, int | float]]:
+        """Az adott csúcs szomszédainak címkéit és az odavezető élek súlyát adja vissza."""
+        i = self.index[vertex_label]
+        labels, targets, weights = self.labels, self.targets, self.weights
+        return [(labels[targets[k]], weights[k]) for k in range(self.offsets[i], self.offsets[i + 1])]
+
+    def breadth_first_levels(self, start_vertex_labels: str | Iterable[str],
+                             max_depth: int | None = None) -> Iterator[tuple[int, list[str]]]:
+        """A Graph.breadth_first_levels metódussal azonos, szintenként haladó szélességi bejárás."""
+        if isinstance(start_vertex_labels, str):
+            start_vertex_labels = (start_vertex_labels,)
+        offsets, targets, labels, index = self.offsets, self.targets, self.labels, self.index
+        start_vertex_labels = list(dict.fromkeys(start_vertex_labels))
+        visited = bytearray(len(self))
+        unvisited = deque()
+        for label in start_vertex_labels:
+            if (i := index.get(label)) is not None:
+                visited[i] = 1
+                unvisited.append(i)
+        # Az ismeretlen kiinduló csúcsokat is kiadjuk a 0. szinten, ahogy a Graph esetén.
+        yield 0, start_vertex_labels
+        depth = 0
+        while unvisited and (max_depth is None or depth < max_depth):
+            for _ in range(len(unvisited)):
+                current = unvisited.popleft()
+                for k in range(offsets[current], offsets[current + 1]):
+                    neighbor = targets[k]
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        unvisited.append(neighbor)
+            depth += 1
+            if unvisited:
+                yield depth, [labels[i] for i in unvisited]
+
+    @Graph.instrumented_query
+    def breadth_first_traversal(self, start_vertex_label: str, max_depth: int | None = None) -> list[str]:
+        """A megadott csúcstól kezdődő szélességi bejárás sorrendjében adja vissza a csúcsok címkéit."""
+        return [vertex_label for depth, frontier in self.breadth_first_levels(start_vertex_label, max_depth)
+                for vertex_label in frontier]
+
+    @Graph.instrumented_query
+    def breadth_first_iterator(self, start_vertex_label: str, max_depth: int | None = None) -> Iterator[str]:
+        """A szélességi bejárás során sorra kerülő csúcsok címkéit egyenként adja ki."""
+        for depth, frontier in self.breadth_first_levels(start_vertex_label, max_depth):
+            yield from frontier
+
+    def depth_first_traversal(self, start_vertex_label: str) -> list[str]:
+        """A megadott csúcstól kezdődő mélységi bejárás sorrendjében adja vissza a csúcsok címkéit."""
+        return list(self.depth_first_iterator(start_vertex_label))
+
+    @Graph.instrumented_query
+    def depth_first_iterator(self, start_vertex_label: str) -> Iterator[str]:
+        """A mélységi bejárás során sorra kerülő csúcsok címkéit egyenként adja ki."""
+        if start_vertex_label not in self.index:
+            yield start_vertex_label
+            return
+        offsets, targets, labels = self.offsets, self.targets, self.labels
+        visited = bytearray(len(self))
+        unvisited = [self.index[start_vertex_label]]  # LIFO módban használjuk (verem).
+        while unvisited:
+            current = unvisited.pop()
+            if not visited[current]:
+                visited[current] = 1
+                yield labels[current]
+                unvisited.extend(neighbor for neighbor in targets[offsets[current]:offsets[current + 1]]
+                                 if not visited[neighbor])
+
+    @Graph.instrumented_query
+    def shortest_paths(self, start_vertex_label: str, target: str | None = None,
+                       cancel: threading.Event | None = None) -> ShortestPaths:
+        """A Graph.shortest_paths metódussal azonos eredményt adó, a tömbökön futó Dijkstra algoritmus.
+        Ha a cancel esemény a keresés közben beáll, akkor a keresés QueryCancelled kivétellel megszakad.
+        """
+        stats = self.instrumentation.current() if self.instrumentation is not None else None
+        self._check_edge_weight_values()
+        if stats is not None:
+            stats.lap('validation')
+        if start_vertex_label not in self.index:
+            return ShortestPaths(start_vertex_label, {}, {})
+        start, target = self.index[start_vertex_label], self.index.get(target, -1)
+        if stats is None:
+            tentative, predecessors, settled = self._dijkstra(start, target, cancel=cancel)
+        else:
+            tentative, predecessors, settled = self._dijkstra(start, target, stats.counting(heappush, 'queue_pushes'),
+                                                              cancel, stats.counting_items(range, 'edges_relaxed'))
+            stats.lap('search')
+            stats.count_search(len(settled))
+        # Az eredményt csak a véglegessé vált csúcsokra fordítjuk vissza címkékre.
+        labels = self.labels
+        settled.sort()
+        distances = {labels[i]: tentative[i] for i in settled}
+        preds = {labels[i]: labels[predecessors[i]] if predecessors[i] >= 0 else None for i in settled}
+        result = ShortestPaths(start_vertex_label, distances, preds)
+        if stats is not None:
+            stats.lap('reconstruction')
+        return result
+
+    def _check_edge_weight_values(self):
+        """Ellenőrzi, hogy nincs-e negatív élsúly. Ha van, akkor kivételt dob."""
+        if self._min_weight is None:
+            self._min_weight = min(self.weights, default=0)
+        if self._min_weight < 0:
+            raise TypeError('Minden él súlyának nem negatív valós számnak kell lenni.')
+
+    def _dijkstra(self, start: int, target: int = -1, push: Callable = heappush,
+                  cancel: threading.Event | None = None, arc_range: Callable = range) -> tuple[list, array, list[int]]:
+        """A start indexű csúcsból induló Dijkstra algoritmus az indexeken.
+        Visszaadja a csúcsok ismert legrövidebb úthosszainak listáját (az el nem értekre végtelen), a legrövidebb
+        úton megelőző csúcsok indexeinek tömbjét (-1, ha nincs ilyen), valamint a véglegessé vált csúcsok indexeit
+        abban a sorrendben, ahogy véglegessé váltak. Ha a target index meg van adva, akkor a keresés leáll, amint
+        ez a csúcs véglegessé vált. A push a prioritási sorba tevő, az arc_range pedig egy csúcs éleinek
+        indextartományát előállító függvény, amelyeket a mérés számlálóval bővít.
+        A cancel eseményt cancel_interval véglegessé vált csúcsonként vizsgálja, és ha beállt, akkor QueryCancelled
+        kivételt dob.
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        tentative = [inf] * len(self)
+        tentative[start] = 0
+        predecessors = array('q', [-1]) * len(self)
+        done = bytearray(len(self))
+        settled = []
+        # Az egyenlő úthosszú csúcsok közül a kisebb indexű kerül előbb sorra, ahogy a Graph esetén is.
+        heap = [(0, start)]
+        while heap:
+            distance, current = heappop(heap)
+            if done[current]:
+                continue
+            done[current] = 1
+            settled.append(current)
+            if current == target:
+                break
+            if cancel is not None and not len(settled) % self.cancel_interval and cancel.is_set():
+                raise QueryCancelled(f'A {self.labels[start]} csúcsból indított keresés megszakítva.')
+            for k in arc_range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                if done[neighbor]:
+                    continue
+                new_distance = distance + float(weights[k])
+                if new_distance < tentative[neighbor]:
+                    tentative[neighbor] = new_distance
+                    predecessors[neighbor] = current
+                    push(heap, (new_distance, neighbor))
+        return tentative, predecessors, settled
+
+    def shortest_paths_many(self, start_vertex_labels: Iterable[str], workers: int | None = None,
+                            matrix: bool = False):
+        """Több kiinduló csúcsból számítja a legrövidebb utakat, opcionálisan több folyamatban párhuzamosan.
+        Alapesetben egy iterátort ad vissza, amely a (kiinduló csúcs címkéje, ShortestPaths) párosokat abban
+        a sorrendben adja ki, ahogy az egyes kiinduló csúcsokra a számítás befejeződik.
+        Ha a matrix igaz, akkor csak a távolságokat adja vissza egy sűrű mátrixban: ez egy lista, amelynek
+        i. eleme az i. kiinduló csúcsból a labels sorrendjében vett csúcsokig mért távolságok tömbje.
+        Ha a workers értéke legalább 2, akkor a számítás ennyi folyamatban fut. A gráf tömbjei folyamatonként
+        csak egyszer kerülnek átadásra, a feladatok már csak a kiinduló csúcsok indexeit tartalmazzák.
+        """
+        self._check_edge_weight_values()
+        start_vertex_labels = list(start_vertex_labels)
+        if matrix:
+            return self._distance_matrix(start_vertex_labels, workers)
+        return self._iter_shortest_paths_many(start_vertex_labels, workers)
+
+    def _iter_shortest_paths_many(self, start_vertex_labels: list[str], workers: int | None):
+        labels, index = self.labels, self.index
+        known = [label for label in start_vertex_labels if label in index]
+        for label in start_vertex_labels:
+            if label not in index:
+                yield label, ShortestPaths(label, {}, {})
+        for start, tentative, predecessors in self._map_dijkstra([index[label] for label in known], workers, True):
+            reached = [i for i, distance in enumerate(tentative) if distance != inf]
+            distances = {labels[i]: tentative[i] for i in reached}
+            preds = {labels[i]: labels[predecessors[i]] if predecessors[i] >= 0 else None for i in reached}
+            yield labels[start], ShortestPaths(labels[start], distances, preds)
+
+    def _distance_matrix(self, start_vertex_labels: list[str], workers: int | None) -> list[array]:
+        index = self.index
+        matrix = [array('d', [inf]) * len(self) for _ in start_vertex_labels]
+        rows = defaultdict(list)  # Egy kiinduló csúcs többször is szerepelhet.
+        for row, label in enumerate(start_vertex_labels):
+            if label in index:
+                rows[index[label]].append(row)
+        for start, tentative, predecessors in self._map_dijkstra(list(rows), workers, False):
+            for row in rows[start]:
+                matrix[row] = tentative
+        return matrix
+
+    def _map_dijkstra(self, starts: list[int], workers: int | None, with_predecessors: bool):
+        """A kiinduló csúcsindexekre futtatja a Dijkstra algoritmust, és az eredményeket a befejeződés
+        sorrendjében adja ki (kiinduló index, távolságok tömbje, megelőzők tömbje vagy None) hármasokként.
+        """
+        if not workers or workers < 2 or len(starts) < 2:
+            for start in starts:
+                yield _shortest_paths_task(self, start, with_predecessors)
+            return
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,))
+        try:
+            futures = [executor.submit(_worker_shortest_paths_task, start, with_predecessors) for start in starts]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Ha a hívó a generátort idő előtt lezárja, akkor csak a már futó feladatokat várjuk meg, a még el nem
+            # kezdetteket elvetjük.
+            executor.shutdown(cancel_futures=True)
+
+    def __reduce__(self):
+        # A fájlra leképezett nézetnek csak az elérési útját adjuk át, így a fogadó folyamat ugyanazt a fájlt
+        # képezi le, és a tömbök az operációs rendszer lapgyorsítótárán keresztül megosztottak maradnak. Ez csak
+        # akkor helyes, ha a fájl azóta nem változott (például a save nem cserélte le), ezért a fájl azonosítóját
+        # is átadjuk, amit a fogadó folyamat ellenőriz.
+        if self._path is not None:
+            try:
+                unchanged = _file_identity(stat(self._path)) == self._file_identity
+            except OSError:
+                unchanged = False
+            if unchanged:
+                return type(self)._load_unchanged, (self._path, self._file_identity)
+        # Egyébként csak a címkéket és a tömböket adjuk át, az index szótárt újraépítjük.
+        return type(self), (list(self.labels), *(None if data is None else _as_array(data)
+                                                 for data in (self.offsets, self.targets, self.weights, self.coords)))
+
+    def vertex_coords(self) -> dict[str, tuple[float, float]]:
+        """A csúcsok címkéihez tartozó (x, y) koordinátákat adja vissza. Ha nincsenek koordináták, akkor üres."""
+        if self.coords is None:
+            return {}
+        coords = self.coords
+        return {label: (coords[2 * i], coords[2 * i + 1]) for i, label in enumerate(self.labels)}
+
+    def to_graph(self) -> Graph:
+        """A nézetből egy szerkeszthető Graph példányt hoz létre."""
+        graph = Graph()
+        for label in self.labels:
+            graph.vertices[label] = Vertex(label)
+        labels, targets, weights, offsets = self.labels, self.targets, self.weights, self.offsets
+        graph.add_connections((labels[i], labels[targets[k]], weights[k])
+                              for i in range(len(self)) for k in range(offsets[i], offsets[i + 1]))
+        graph.positions.update(self.vertex_coords())
+        return graph
+
+    def save(self, path, coords: Mapping[str, tuple[float, float]] | None = None):
+        """A nézetet bináris pillanatkép fájlba menti. Opcionálisan a csúcsok síkbeli koordinátái is menthetők
+        egy címke -> (x, y) szótárban; az ebben nem szereplő csúcsok koordinátái (0, 0) lesznek.
+        A fájl felépítése (minden szakasz 8 bájtos határra igazítva):
+        fejléc, címkék kezdőpozíciói (int64, n + 1 db), a címkék UTF-8 kódolású bájtjai, offsets (int64, n + 1 db),
+        targets (int64, m db), weights (int64 vagy float64, m db), opcionálisan a koordináták (float64, 2n db).
+        """
+        encoded_labels = [str(label).encode('utf-8') for label in self.labels]
+        label_offsets = array('q', [0])
+        for encoded_label in encoded_labels:
+            label_offsets.append(label_offsets[-1] + len(encoded_label))
+        if coords is None and self.coords is not None:
+            coords = self.vertex_coords()
+        flags = _SNAPSHOT_BIG_ENDIAN if sys.byteorder == 'big' else 0
+        if coords is not None:
+            flags |= _SNAPSHOT_HAS_COORDS
+            coords = array('d', (value for label in self.labels for value in coords.get(label, (0.0, 0.0))))
+        weight_typecode = 'q' if _array_typecode(self.weights) == 'q' else 'd'
+        sections = [label_offsets, b''.join(encoded_labels), array('q', self.offsets), array('q', self.targets),
+                    array(weight_typecode, self.weights)]
+        if coords is not None:
+            sections.append(coords)
+
+        # A meglevő fájlt nem írjuk felül helyben, mert egy rá leképezett nézet (akár egy másik folyamatban) a
+        # csonkolt fájl vége után olvasna. Egy ideiglenes fájlba írunk, és azt nevezzük át a helyére, így a
+        # leképezések a régi tartalmat látják tovább.
+        path = abspath(path)
+        temporary_path = join(dirname(path), f'.{basename(path)}.{token_hex(4)}.tmp')
+        try:
+            with open(temporary_path, 'xb') as file:
+                file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, ord(weight_typecode), flags,
+                                                 len(self), self.edge_count, label_offsets[-1]))
+                for section in sections:
+                    data = section.tobytes() if isinstance(section, array) else section
+                    file.write(data)
+                    file.write(bytes(-len(data) % 8))
+            replace(temporary_path, path)
+        except BaseException:
+            try:
+                unlink(temporary_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path) -> 'CompactGraph':
+        """Bináris pillanatkép fájlból tölti be a nézetet. A fájlt a memóriába képezi le, és a tömbök közvetlenül
+        a leképezett tartalomra mutatnak, így a betöltés nem másolja és nem is olvassa végig az adatokat.
+        A címkéket csak akkor dekódolja, amikor azokra szükség van.
+        """
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            file_identity = _file_identity(fstat(file.fileno()))
+        try:
+            weight_typecode, flags, n, m, labels_size = cls._check_snapshot(buffer, path)
+        except BaseException:
+            buffer.close()
+            raise
+        view = memoryview(buffer)
+        position = _SNAPSHOT_HEADER.size
+
+        def section(size, typecode=None):
+            nonlocal position
+            data = view[position:position + size]
+            position += size + -size % 8
+            return data.cast(typecode) if typecode else data
+
+        label_offsets = section(8 * (n + 1), 'q')
+        labels = _LabelTable(label_offsets, section(labels_size))
+        offsets, targets = section(8 * (n + 1), 'q'), section(8 * m, 'q')
+        weights = section(8 * m, chr(weight_typecode))
+        coords = section(8 * 2 * n, 'd') if flags & _SNAPSHOT_HAS_COORDS else None
+        compact_graph = cls(labels, offsets, targets, weights, coords)
+        compact_graph._path, compact_graph._file_identity = path, file_identity
+        return compact_graph
+
+    @classmethod
+    def _load_unchanged(cls, path, file_identity: tuple) -> 'CompactGraph':
+        """A load azzal az ellenőrzéssel, hogy a fájl azonosítója a megadott. Ha a fájlt közben lecserélték vagy
+        módosították, akkor ValueError kivétel keletkezik, és nem egy másik gráf nézete jön létre.
+        """
+        compact_graph = cls.load(path)
+        if compact_graph._file_identity != file_identity:
+            raise ValueError(f'{path} megváltozott a nézet átadása óta.')
+        return compact_graph
+
+    @staticmethod
+    def _check_snapshot(buffer, path) -> tuple[int, int, int, int, int]:
+        """Ellenőrzi a pillanatkép fejlécét, és hogy a fájl hossza megegyezik-e a fejlécben megadott méretekből
+        adódó hosszal. Visszaadja a (súlyok típuskódja, jelzők, n, m, címkék bájtszáma) ötöst. Hibás vagy
+        csonka fájl esetén ValueError kivétel keletkezik.
+        """
+        if len(buffer) < _SNAPSHOT_HEADER.size:
+            raise ValueError(f'{path} nem gráf pillanatkép fájl.')
+        magic, version, weight_typecode, flags, n, m, labels_size = _SNAPSHOT_HEADER.unpack_from(buffer)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION or chr(weight_typecode) not in 'qd':
+            raise ValueError(f'{path} nem támogatott gráf pillanatkép fájl.')
+        if bool(flags & _SNAPSHOT_BIG_ENDIAN) != (sys.byteorder == 'big'):
+            raise ValueError(f'{path} eltérő bájtsorrendű gépen készült.')
+        if n < 0 or m < 0 or labels_size < 0:
+            raise ValueError(f'{path} sérült gráf pillanatkép fájl.')
+
+        def padded(size):
+            return size + -size % 8
+
+        labels_position = _SNAPSHOT_HEADER.size + 8 * (n + 1) + padded(labels_size)
+        expected_size = labels_position + 8 * (n + 1) + 2 * 8 * m
+        if flags & _SNAPSHOT_HAS_COORDS:
+            expected_size += 8 * 2 * n
+        if len(buffer) != expected_size:
+            raise ValueError(f'{path} csonka vagy sérült gráf pillanatkép fájl: {len(buffer)} bájt, '
+                             f'a fejléc szerint {expected_size} bájt.')
+        # A címkék és az élek kezdőpozícióinak utolsó eleme a címkék bájtszáma, illetve az élek száma.
+        last_label_offset, = struct.unpack_from('=q', buffer, _SNAPSHOT_HEADER.size + 8 * n)
+        last_offset, = struct.unpack_from('=q', buffer, labels_position + 8 * n)
+        if last_label_offset != labels_size or last_offset != m:
+            raise ValueError(f'{path} sérült gráf pillanatkép fájl.')
+        return weight_typecode, flags, n, m, labels_size
+
+
+def _shortest_paths_task(graph: CompactGraph, start: int, with_predecessors: bool):
+    tentative, predecessors, settled = graph._dijkstra(start)
+    return start, array('d', tentative), predecessors if with_predecessors else None
+
+
+# A párhuzamos számításnál a munkafolyamatok ebben tárolják a nekik egyszer átadott gráfot.
+_worker_graph: CompactGraph | None = None
+
+
+def _init_worker(graph: CompactGraph):
+    global _worker_graph
+    _worker_graph = graph
+
 
+def _worker_shortest_paths_task(start: int, with_predecessors: bool):
+    return _shortest_paths_task(_worker_graph, start, with_predecessors)
@@ -1,13 +1,159 @@
+import threading
 import tkinter as tk
-from itertools import count
-from graph_model import Vertex, Graph
+from collections import defaultdict
+from itertools import chain, count, cycle, islice
+from math import cos, pi, sin
+from queue import Empty, SimpleQueue
+from tkinter import filedialog
+from typing import Callable, Hashable, Iterable, Iterator
+from graph_model import CompactGraph, Graph, Instrumentation, QueryCancelled
+
+
+class SpatialGrid:
+    """Síkbeli pontok rács alapú térbeli indexe. A pontokat cell_size oldalhosszú négyzetes cellákba sorolja,
+    így egy adott hely közelében levő pontok keresésekor csak a szomszédos cellákat kell megvizsgálni.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.points: dict[str, tuple[float, float]] = dict()
+        self.cells: dict[tuple[int, int], set[str]] = defaultdict(set)
+
+    def cell(self, x, y) -> tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, key: str, x, y):
+        """Egy pont felvétele, vagy ha már létezik, akkor áthelyezése."""
+        if key in self.points:
+            self.remove(key)
+        self.points[key] = (x, y)
+        self.cells[self.cell(x, y)].add(key)
+
+    def remove(self, key: str):
+        x, y = self.points.pop(key)
+        cell = self.cell(x, y)
+        self.cells[cell].discard(key)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def clear(self):
+        self.points.clear()
+        self.cells.clear()
+
+    def in_rect(self, x0, y0, x1, y1) -> Iterator[str]:
+        """Az x0,y0 bal felső és x1,y1 jobb alsó sarkú téglalapba eső pontok kulcsai."""
+        (cx0, cy0), (cx1, cy1) = self.cell(x0, y0), self.cell(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # Ha a téglalap több cellát fed le, mint amennyi nem üres, akkor a nem üres cellákat nézzük végig.
+            cells = (cell for cell in self.cells if cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1)
+        else:
+            cells = ((cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1))
+        for cell in cells:
+            for key in self.cells.get(cell, ()):
+                x, y = self.points[key]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    yield key
+
+    def nearest(self, x, y, max_distance) -> str | None:
+        """Az x,y helyhez legközelebbi, attól legfeljebb max_distance távolságra levő pont kulcsa, vagy None."""
+        nearest_key, nearest_distance = None, max_distance ** 2
+        for key in self.in_rect(x - max_distance, y - max_distance, x + max_distance, y + max_distance):
+            px, py = self.points[key]
+            if (distance := (px - x) ** 2 + (py - y) ** 2) <= nearest_distance:
+                nearest_key, nearest_distance = key, distance
+        return nearest_key
+
+
+class SegmentGrid:
+    """Síkbeli szakaszok többszintű, rács alapú térbeli indexe. A k. szinten a cellák oldalhossza
+    cell_size * 2 ** k, és minden szakasz azon a legkisebb szinten szerepel, amelynek cellájánál a befoglaló
+    téglalapja nem nagyobb, így legfeljebb négy cellába kerül. A hosszú szakaszok így sem foglalnak sok cellát,
+    és egy téglalapba eső szakaszok keresésekor szintenként csak a téglalap közelében levő cellákat kell
+    megvizsgálni.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.segments: dict[Hashable, tuple[float, float, float, float]] = dict()  # kulcs -> befoglaló téglalap
+        self.levels: dict[int, dict[tuple[int, int], set[Hashable]]] = defaultdict(lambda: defaultdict(set))
+
+    def level(self, x0, y0, x1, y1) -> int:
+        """A legkisebb szint, amelynek cellájánál a téglalap nem nagyobb."""
+        level, size = 0, self.cell_size
+        while max(x1 - x0, y1 - y0) > size:
+            level, size = level + 1, 2 * size
+        return level
+
+    def cells(self, level: int, x0, y0, x1, y1) -> Iterator[tuple[int, int]]:
+        """A szint téglalap által lefedett celláinak koordinátái."""
+        size = self.cell_size * 2 ** level
+        cx0, cy0, cx1, cy1 = int(x0 // size), int(y0 // size), int(x1 // size), int(y1 // size)
+        return ((cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1))
+
+    def insert(self, key: Hashable, x0, y0, x1, y1):
+        """Az x0,y0 és x1,y1 végpontú szakasz felvétele, vagy ha már létezik, akkor áthelyezése."""
+        if key in self.segments:
+            self.remove(key)
+        bbox = self.segments[key] = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        cells = self.levels[level := self.level(*bbox)]
+        for cell in self.cells(level, *bbox):
+            cells[cell].add(key)
+
+    def remove(self, key: Hashable):
+        bbox = self.segments.pop(key)
+        cells = self.levels[level := self.level(*bbox)]
+        for cell in self.cells(level, *bbox):
+            cells[cell].discard(key)
+            if not cells[cell]:
+                del cells[cell]
+        if not cells:
+            del self.levels[level]
+
+    def clear(self):
+        self.segments.clear()
+        self.levels.clear()
+
+    def in_rect(self, x0, y0, x1, y1) -> Iterator[Hashable]:
+        """Azon szakaszok kulcsai, amelyek befoglaló téglalapja metszi az x0,y0 bal felső és x1,y1 jobb alsó
+        sarkú téglalapot.
+        """
+        seen = set()
+        for level, cells in self.levels.items():
+            size = self.cell_size * 2 ** level
+            # A szakasz minden olyan cellában szerepel, amelyet a befoglaló téglalapja lefed, így elég a
+            # keresett téglalap által lefedett cellákat megvizsgálni.
+            cx0, cy0, cx1, cy1 = int(x0 // size), int(y0 // size), int(x1 // size), int(y1 // size)
+            if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+                # Ha a téglalap több cellát fed le, mint amennyi nem üres, akkor a nem üres cellákat nézzük végig.
+                level_cells = (cell for cell in cells if cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1)
+            else:
+                level_cells = ((cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1))
+            for cell in level_cells:
+                for key in cells.get(cell, ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    bx0, by0, bx1, by1 = self.segments[key]
+                    if bx0 <= x1 and x0 <= bx1 and by0 <= y1 and y0 <= by1:
+                        yield key
+
+
+def segment_distance_squared(px, py, x0, y0, x1, y1) -> float:
+    """A px,py pont és az x0,y0, x1,y1 végpontú szakasz távolságának négyzete."""
+    dx, dy = x1 - x0, y1 - y0
+    length_squared = dx * dx + dy * dy
+    # A pont merőleges vetülete a szakasz egyenesén, a szakasz végpontjai közé szorítva.
+    t = min(max(((px - x0) * dx + (py - y0) * dy) / length_squared, 0.0), 1.0) if length_squared else 0.0
+    return (px - x0 - t * dx) ** 2 + (py - y0 - t * dy) ** 2
 
 
 class GraphApp(tk.Tk):
     def __init__(self):
         super().__init__()
-        # A modellből létrehozzuk a gráf példányt.
+        # A modellből létrehozzuk a gráf példányt. A lekérdezései mérését bekapcsoljuk, hogy a legutóbbi
+        # futás adatai megjeleníthetők legyenek. A mérés a gráf cseréjekor is ugyanez marad.
         self.graph = Graph()
+        self.instrumentation = self.graph.enable_instrumentation(Instrumentation())
         # A főablak címe és mérete.
         self.title('Gráf rajzoló')
         self.geometry('1200x600')
@@ -19,19 +165,39 @@ class GraphApp(tk.Tk):
         self.frame2.pack_propagate(False)
         # A vászon és az eredménymegjelenítés grafikus elemei.
         self.cnv = tk.Canvas(self.frame1, bg='LightSkyBlue1')
+        # A kimeneti szöveget az output_var változó beállítása cseréli le. Az algoritmusok kimenete ezzel
+        # szemben kötegenként a szövegmező végére kerül, így nem kell minden kötegnél a teljes szöveget újraírni.
         self.output_var = tk.StringVar(self)
-        self.output_label = tk.Label(self.frame2, bg='white', font=('Consolas', 14, 'bold'), justify=tk.LEFT,
-                                     anchor='nw', textvariable=self.output_var)
+        self.output_text = tk.Text(self.frame2, bg='white', font=('Consolas', 14, 'bold'), wrap=tk.WORD,
+                                   bd=0, highlightthickness=0, state=tk.DISABLED)
+        self.output_var.trace_add('write', lambda *_: self.show_output())
         # A különféle parancsokhoz a nyomógombok létrehozása és a megfelelő metódusok hozzárendelése.
         common_configs = dict(font=('Segoe UI', 10, 'bold'))
         self.buttons = [tk.Button(self.frame0, text='Törlés',
                                   command=self.clear, **common_configs),
+                        tk.Button(self.frame0, text='Mentés',
+                                  command=self.save_snapshot, **common_configs),
+                        tk.Button(self.frame0, text='Megnyitás',
+                                  command=self.open_snapshot, **common_configs),
+                        tk.Button(self.frame0, text='Élfájl betöltése',
+                                  command=self.load_edge_file, **common_configs),
                         tk.Button(self.frame0, text='Szomszédsági kapcsolatok', **common_configs,
                                   command=lambda: self.output_var.set(self.get_adjacency())),
                         tk.Button(self.frame0, text='Szélességi bejárás', **common_configs,
-                                  command=lambda: self.output_var.set(self.get_bfs(self.start_vertex_entry.get()))),
+                                  command=lambda: self.run_algorithm('Szélességi bejárás', self.bfs_steps)),
                         tk.Button(self.frame0, text='Mélységi bejárás', **common_configs,
-                                  command=lambda: self.output_var.set(self.get_dfs(self.start_vertex_entry.get())))]
+                                  command=lambda: self.run_algorithm('Mélységi bejárás', self.dfs_steps)),
+                        tk.Button(self.frame0, text='Legrövidebb utak', **common_configs,
+                                  command=lambda: self.run_algorithm('Legrövidebb utak', self.shortest_paths_steps,
+                                                                     separator='\n')),
+                        tk.Button(self.frame0, text='Komponensek',
+                                  command=self.color_components, **common_configs),
+                        tk.Button(self.frame0, text='Elrendezés',
+                                  command=self.run_layout, **common_configs),
+                        tk.Button(self.frame0, text='Megszakítás', **common_configs,
+                                  command=self.cancel_algorithm),
+                        tk.Button(self.frame0, text='Statisztika', **common_configs,
+                                  command=lambda: self.output_var.set(self.get_stats()))]
         # A teljes gráfbejáráshoz meg lehet adni a kezdő csúcsot egy beviteli mezőben.
         self.entry_lbl = tk.Label(self.frame0, text='Kezdőcsúcs: ', **common_configs)
         self.start_vertex_entry = tk.Entry(self.frame0, width=5, font=('Consolas', 14, 'bold'))
@@ -45,8 +211,61 @@ class GraphApp(tk.Tk):
         # Grafikus elemek, események és eseménykezelők összerendelése.
         self.bind_event_handlers()
 
-        # Az összekötéshez kijelölt kezdő- és végcsúcs. Ha None, akkor nincs kijelölt csúcs.
+        # A vászon elemeinek és a modell csúcsainak, éleinek összerendelései, valamint a csúcsok helyének
+        # térbeli indexe, hogy a kijelöléshez, összekötéshez és törléshez ne kelljen a vásznat lekérdezni.
+        self.vertex_items: dict[str, tuple[int, int]] = dict()  # csúcscímke -> (kör, címke elem)
+        self.edge_items: dict[frozenset[str], int] = dict()  # csúcscímke pár -> vonal elem
+        self.item_edges: dict[int, tuple[str, str]] = dict()  # vonal elem -> (kezdőcsúcs, végcsúcs)
+        self.vertex_grid = SpatialGrid(2 * self.r)
+        # Az élek térbeli indexe, hogy a nézetbe eső éleket akkor is megtaláljuk, ha egyik végpontjuk sem látszik.
+        self.edge_grid = SegmentGrid(2 * self.r)
+
+        # A nézet nagyítása és eltolása: egy csúcs (x, y) helyének képe a vásznon (x * scale + offset_x,
+        # y * scale + offset_y). A lod_scale-nél kisebb nagyításnál a címkéket és a nyílhegyeket nem rajzoljuk.
+        self.scale, self.offset_x, self.offset_y = 1.0, 0.0, 0.0
+        self.lod_scale = 0.5
+        # A rajzolás egyszerre render_batch_size elemenként, az eseménykezelések között halad. A folyamatban
+        # levő rajzolás hátralevő lépései és az ütemezett Tk feladatok azonosítói.
+        self.render_batch_size = 500
+        self._render_queue = iter(())
+        self._render_job = self._schedule_render_job = None
+        self._pan_start = None
+
+        # Az algoritmusok háttérszálon futnak, az eredményük pedig output_interval ezredmásodpercenként,
+        # legfeljebb output_batch_size elemenként kerül a kimeneti felületre. A meglátogatott csúcsokat
+        # a vásznon visited_color színnel jelöljük.
+        self.output_interval, self.output_batch_size = 50, 200
+        self.visited_color = 'gold'
+        self.vertex_colors: dict[str, str] = dict()  # csúcscímke -> kitöltőszín, ha az nem az alapértelmezett
+        self._algorithm_cancel = threading.Event()
+        self._algorithm_results = SimpleQueue()
+        self._algorithm_step_count = 0
+        self._algorithm_separator = ''
+        self._algorithm_job = None
+        # A háttérszálak a gráf tömör nézetét maguk készítik el, hogy a nagy gráf másolása ne akassza meg a
+        # felületet. A másolás alatt a gráf nem módosulhat, ezért a gráfot módosító eseménykezelők és a másolás
+        # ezt a zárat tartják.
+        self._graph_lock = threading.Lock()
+        # Az automatikus elrendezés is háttérszálon fut layout_iterations lépésig, a csúcsok közben kiszámított
+        # helyei pedig output_interval ezredmásodpercenként kerülnek a vászonra.
+        self.layout_iterations = 100
+        self._layout_cancel = threading.Event()
+        self._layout_results = SimpleQueue()
+        self._layout_job = None
+
+        # Az összekötéshez kijelölt kezdő- és végcsúcs címkéje. Ha None, akkor nincs kijelölt csúcs.
         self.selected_vertex1 = self.selected_vertex2 = None
+        # A kijelölt él kezdő- és végcsúcsának címkéje. Ha None, akkor nincs kijelölt él.
+        self.selected_edge = None
+        # A legrövidebb útvonal keresés kijelölt kezdőcsúcsa, valamint a megtalált útvonal éleinek
+        # csúcscímke párjai, amelyeket route_color színnel emelünk ki.
+        self.route_start = None
+        self.route_edges: set[frozenset[str]] = set()
+        self.route_color = 'orange'
+        # Az összefüggő komponensek kiszínezésekor a komponensek ezeket a színeket kapják, méret szerint
+        # csökkenő sorrendben. Ha több komponens van, mint szín, akkor a színek ismétlődnek.
+        self.component_colors = ['gold', 'pale green', 'light pink', 'light salmon', 'plum', 'pale turquoise',
+                                 'khaki', 'light steel blue', 'peach puff', 'thistle']
 
     def place_widgets(self):
         """Az egyes grafikus elemek lehelyezése a főablakban és a keretekben."""
@@ -58,7 +277,7 @@ class GraphApp(tk.Tk):
             widget.pack(side=tk.LEFT, fill=tk.X, expand=False, padx=2, pady=2)
 
         self.cnv.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
-        self.output_label.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
+        self.output_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
 
     def bind_event_handlers(self):
         """Grafikus elemek, események és eseménykezelők összerendelése."""
@@ -77,14 +296,42 @@ class GraphApp(tk.Tk):
         self.cnv.tag_bind('edge', '<Double Button 1>', self.select_edge)
         # Kijelölt él jobb egérgomb kattintással törölhető.
         self.cnv.tag_bind('edge', '<Button 3>', self.remove_edge)
+        # Shift+bal egérgomb kattintással kijelölt két csúcs közötti legrövidebb útvonal kiemelése.
+        self.cnv.bind('<Shift Button 1>', self.select_route_vertex)
+        # Egérgörgővel nagyítható, középső egérgombbal vonszolva eltolható a nézet.
+        self.cnv.bind('<MouseWheel>', lambda e: self.zoom(e, 1.2 if e.delta > 0 else 1 / 1.2))
+        self.cnv.bind('<Button 4>', lambda e: self.zoom(e, 1.2))
+        self.cnv.bind('<Button 5>', lambda e: self.zoom(e, 1 / 1.2))
+        self.cnv.bind('<Button 2>', self.pan_start)
+        self.cnv.bind('<B2 Motion>', self.pan_move)
+        self.cnv.bind('<ButtonRelease 2>', lambda e: self.schedule_render())
+        # A vászon átméretezésekor a láthatóvá vált részt is meg kell rajzolni.
+        self.cnv.bind('<Configure>', lambda e: self.schedule_render())
 
     def clear(self):
         """Az aktuális gráf és megjelenítésének törlése, ami egy új gráf készítését teszi lehetővé."""
+        self.cancel_algorithm(discard_output=True)
         self.graph = Graph()
+        self.graph.enable_instrumentation(self.instrumentation)
         self.vertex_label_gen = count()
+        self.vertex_colors.clear()
+        self.route_start = None
+        self.route_edges.clear()
+        self.cancel_render()
         self.cnv.delete('all')
+        self.clear_item_indexes()
+        self.vertex_grid.clear()
+        self.edge_grid.clear()
+        self.selected_vertex1 = self.selected_vertex2 = self.selected_edge = None
+        self.scale, self.offset_x, self.offset_y = 1.0, 0.0, 0.0
         self.output_var.set('')
 
+    def clear_item_indexes(self):
+        """A vászon elemeit nyilvántartó indexek ürítése."""
+        self.vertex_items.clear()
+        self.edge_items.clear()
+        self.item_edges.clear()
+
     def get_adjacency(self):
         """Az aktuális gráf szomszédsági viszonyait reprezentáló karakterláncot ad vissza."""
         txt = ''
@@ -93,52 +340,318 @@ class GraphApp(tk.Tk):
             txt += str(self.graph)
         return txt
 
-    def get_bfs(self, start_label: str):
-        """Az aktuális gráf adott csúcstól kezdődő teljes szélességi bejárásának sorrendjét reprezentáló
-        karakterláncot ad vissza.
+    def get_stats(self):
+        """A legutóbbi befejeződött algoritmusfutás mérési adatait reprezentáló karakterláncot ad vissza."""
+        if (stats := self.instrumentation.last_stats) is None:
+            return 'Még nem fejeződött be algoritmusfutás.'
+        return f'Statisztika:\n{stats}'
+
+    @staticmethod
+    def bfs_steps(graph: CompactGraph, start_label: str, cancel: threading.Event) -> Iterator[tuple[str, str]]:
+        """A szélességi bejárás lépései (csúcscímke, megjelenítendő szöveg) párokként. A bejárás lépésenként
+        halad, így a megszakítást a run_algorithm a lépések között vizsgálja.
         """
-        txt = ''
-        if self.graph.vertices:
-            txt = 'Szélességi bejárás:\n'
-            txt += f' {chr(0x279E)} '.join(
-                str(vertex.label) for vertex in self.graph.breadth_first_iterator(start_label))
-        return txt
+        return ((vertex_label, vertex_label) for vertex_label in graph.breadth_first_iterator(start_label))
 
-    def get_dfs(self, start_label: str):
-        """Az aktuális gráf adott csúcstól kezdődő teljes mélységi bejárásának sorrendjét reprezentáló
-        karakterláncot ad vissza.
+    @staticmethod
+    def dfs_steps(graph: CompactGraph, start_label: str, cancel: threading.Event) -> Iterator[tuple[str, str]]:
+        """A mélységi bejárás lépései (csúcscímke, megjelenítendő szöveg) párokként, lásd bfs_steps."""
+        return ((vertex_label, vertex_label) for vertex_label in graph.depth_first_iterator(start_label))
+
+    @staticmethod
+    def shortest_paths_steps(graph: CompactGraph, start_label: str,
+                             cancel: threading.Event) -> Iterator[tuple[str, str]]:
+        """A kezdőcsúcsból elérhető csúcsokhoz vezető legrövidebb utak hossza és a legrövidebb úton megelőző csúcs.
+        A teljes útvonalakat nem írja ki, mert azok együttes hossza a csúcsok számának és az utak hosszának
+        szorzatával arányos; egy útvonal a megelőző csúcsokon visszafelé haladva követhető.
+        A keresés egyben fut le, ezért a megszakítást maga a keresés is vizsgálja.
         """
-        txt = ''
-        if self.graph.vertices:
-            txt = 'Mélységi bejárás:\n'
-            txt += f' {chr(0x279E)} '.join(str(vertex.label) for vertex in self.graph.depth_first_iterator(start_label))
-        return txt
+        shortest_paths = graph.shortest_paths(start_label, cancel=cancel)
+        predecessors = shortest_paths.predecessors
+        for vertex_label, distance in shortest_paths.distances.items():
+            if (predecessor := predecessors[vertex_label]) is None:
+                yield vertex_label, f'{vertex_label}: {distance:g}'
+            else:
+                yield vertex_label, f'{vertex_label}: {distance:g}  ({chr(0x2190)} {predecessor})'
+
+    def run_algorithm(self, title: str,
+                      steps: Callable[[CompactGraph, str, threading.Event], Iterator[tuple[str, str]]],
+                      separator=f' {chr(0x279E)} '):
+        """Az algoritmus futtatása egy háttérszálon a gráf pillanatnyi állapotáról készült tömör nézeten, így a
+        futás alatt a felület nem akad meg, és a gráf közben szerkeszthető. A steps által kiadott lépések
+        szövegei folyamatosan, kötegekben jelennek meg a kimeneti felületen, a csúcsok pedig kiszíneződnek.
+        A steps a megszakítást jelző eseményt is megkapja, hogy a lépések előállítása közben is leállhasson.
+        """
+        self.cancel_algorithm(discard_output=True)
+        self.clear_vertex_colors()
+        self.clear_route()
+        if not self.graph.vertices:
+            self.output_var.set('')
+            return
+        source_graph, start_label, graph_lock = self.graph, self.start_vertex_entry.get(), self._graph_lock
+        cancel, results = threading.Event(), SimpleQueue()
+        self._algorithm_cancel, self._algorithm_results = cancel, results
+        self._algorithm_step_count = 0
+        self._algorithm_separator = separator
+
+        def work():
+            try:
+                with graph_lock:
+                    graph = source_graph.freeze()
+                for step in steps(graph, start_label, cancel):
+                    if cancel.is_set():
+                        break
+                    results.put(step)
+            except QueryCancelled:
+                pass
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(None)  # A futás végének jelzése.
+
+        threading.Thread(target=work, daemon=True).start()
+        self.output_var.set(f'{title}:\n')
+        self._algorithm_job = self.after(self.output_interval, self._show_algorithm_output)
+
+    def _show_algorithm_output(self):
+        """A háttérszál által addig kiadott, legfeljebb output_batch_size lépés megjelenítése."""
+        self._algorithm_job = None
+        finished, status, texts = False, '', []
+        for _ in range(self.output_batch_size):
+            try:
+                step = self._algorithm_results.get_nowait()
+            except Empty:
+                break
+            if step is None:
+                finished = True
+                break
+            if isinstance(step, Exception):
+                status = f'\nHiba: {step}'
+                continue
+            vertex_label, text = step
+            texts.append(text)
+            self.set_vertex_color(vertex_label, self.visited_color)
+        if finished and self._algorithm_cancel.is_set():
+            status = '\n(megszakítva)'
+        if texts:
+            separator = self._algorithm_separator
+            self.append_output(f'{separator if self._algorithm_step_count else ""}{separator.join(texts)}')
+            self._algorithm_step_count += len(texts)
+        if status:
+            self.append_output(status)
+        if not finished:
+            self._algorithm_job = self.after(self.output_interval, self._show_algorithm_output)
+
+    def show_output(self):
+        """A kimeneti szövegmező tartalmának cseréje az output_var értékére."""
+        self.output_text.configure(state=tk.NORMAL)
+        self.output_text.delete('1.0', tk.END)
+        self.output_text.insert(tk.END, self.output_var.get())
+        self.output_text.configure(state=tk.DISABLED)
+
+    def append_output(self, text: str):
+        """Szöveg hozzáfűzése a kimeneti szövegmező végéhez, amely a végére görget."""
+        self.output_text.configure(state=tk.NORMAL)
+        self.output_text.insert(tk.END, text)
+        self.output_text.configure(state=tk.DISABLED)
+        self.output_text.see(tk.END)
+
+    def cancel_algorithm(self, discard_output=False):
+        """A futó algoritmus megszakítása. A háttérszál a következő lépésnél leáll, a már kiszámított
+        eredmények megjelenítése pedig még befejeződik, hacsak a discard_output igaz.
+        """
+        self._algorithm_cancel.set()
+        self._layout_cancel.set()
+        if discard_output and self._algorithm_job is not None:
+            self.after_cancel(self._algorithm_job)
+            self._algorithm_job = None
+        if discard_output and self._layout_job is not None:
+            self.after_cancel(self._layout_job)
+            self._layout_job = None
+
+    def run_layout(self):
+        """A csúcsok automatikus elrendezése erőalapú módszerrel egy háttérszálon. A kiinduló helyek a csúcsok
+        jelenlegi helyei, és az elrendezés alakulása folyamatosan látható a vásznon.
+        """
+        self.cancel_algorithm(discard_output=True)
+        try:
+            from graph_layout import force_directed_steps
+        except ImportError:
+            self.output_var.set('Az automatikus elrendezéshez a NumPy csomag szükséges.')
+            return
+        if not self.graph.vertices:
+            return
+        source_graph, graph_lock = self.graph, self._graph_lock
+        # A nagy gráfok csúcsai nagyobb területen helyezkednek el, hogy a körök ne fedjék egymást.
+        size = max(self.cnv.winfo_width() / self.scale, self.cnv.winfo_height() / self.scale,
+                   3 * self.r * len(source_graph.vertices) ** 0.5)
+        positions, iterations = self.vertex_positions(), self.layout_iterations
+        cancel, results = threading.Event(), SimpleQueue()
+        self._layout_cancel, self._layout_results = cancel, results
+
+        def work():
+            try:
+                with graph_lock:
+                    graph = source_graph.freeze()
+                for i, coords in enumerate(force_directed_steps(graph, iterations, size, positions), 1):
+                    if cancel.is_set():
+                        break
+                    results.put((i, graph.labels, coords.tolist()))
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(None)  # A futás végének jelzése.
+
+        threading.Thread(target=work, daemon=True).start()
+        self.output_var.set('Elrendezés...')
+        self._layout_job = self.after(self.output_interval, self._show_layout)
+
+    def _show_layout(self):
+        """A háttérszál által legutóbb kiszámított csúcshelyek átvétele és a nézet újrarajzolása.
+        Amíg az előző újrarajzolás kötegei még folyamatban vannak, addig nem kezd újat, mert az újrakezdés
+        eldobná a még meg nem rajzolt elemeket, és nagy gráf esetén a csúcsok sosem jelennének meg. A hátralevő
+        kötegek a csúcsok legújabb helyére rajzolnak, a futás végén pedig a teljes nézet újrarajzolódik.
+        """
+        self._layout_job = None
+        finished, latest, status = False, None, ''
+        while True:
+            try:
+                step = self._layout_results.get_nowait()
+            except Empty:
+                break
+            if step is None:
+                finished = True
+                break
+            if isinstance(step, Exception):
+                status = f'\nHiba: {step}'
+                continue
+            latest = step
+        if latest is not None:
+            iteration, labels, coords = latest
+            # Az elrendezés alatt törölt csúcsokat kihagyjuk, az újonnan felvettek a helyükön maradnak.
+            for vertex_label, (x, y) in zip(labels, coords):
+                if vertex_label in self.vertex_grid.points:
+                    self.place_vertex(vertex_label, x, y)
+            if self._render_job is None and not finished:
+                self.render()
+            self.output_var.set(f'Elrendezés: {iteration}/{self.layout_iterations}{status}')
+        elif status:
+            self.output_var.set(f'Elrendezés:{status}')
+        if finished:
+            self.render()
+            if self._layout_cancel.is_set():
+                self.output_var.set(f'{self.output_var.get()}\n(megszakítva)')
+        else:
+            self._layout_job = self.after(self.output_interval, self._show_layout)
+
+    def color_components(self):
+        """A gráf összefüggő komponenseinek (az élek irányától eltekintve) kiszínezése. A kimeneti felületen
+        a komponensek és az erősen összefüggő komponensek száma, valamint a legnagyobb komponensek mérete látszik.
+        """
+        self.cancel_algorithm(discard_output=True)
+        self.clear_vertex_colors()
+        self.clear_route()
+        components = sorted(self.graph.components(), key=len, reverse=True)
+        for color, component in zip(cycle(self.component_colors), components):
+            for vertex_label in component:
+                self.set_vertex_color(vertex_label, color)
+        shown = 20
+        sizes = ', '.join(str(len(component)) for component in components[:shown])
+        self.output_var.set(f'Összefüggő komponensek: {len(components)}\n'
+                            f'Erősen összefüggő komponensek: {len(self.graph.strongly_connected_components())}\n'
+                            f'Méretek: {sizes}{", ..." if len(components) > shown else ""}')
+
+    def set_vertex_color(self, vertex_label: str, color: str):
+        """A csúcs körének kitöltőszínét állítja be. A szín az újrarajzoláskor is megmarad."""
+        self.vertex_colors[vertex_label] = color
+        if vertex_items := self.vertex_items.get(vertex_label):
+            self.cnv.itemconfig(vertex_items[0], fill=color)
+
+    def clear_vertex_colors(self):
+        """A csúcsok körének kitöltőszínét visszaállítja az alapértelmezettre."""
+        for vertex_label in self.vertex_colors:
+            if vertex_items := self.vertex_items.get(vertex_label):
+                self.cnv.itemconfig(vertex_items[0], fill='white')
+        self.vertex_colors.clear()
 
     def add_vertex(self, event):
         """Csúcs felvétele a gráfba az egérmutató koordinátapozíciójában."""
-        x, y = event.x, event.y
         vertex_label:str = str(next(self.vertex_label_gen))  # A következő csúcscímke kikérése.
-        # A csúcs egy körrel lesz ábrázolva, amelyben a csúcsazonosító címke mint szöveg látszik.
-        self.cnv.create_oval(x - self.r, y - self.r, x + self.r, y + self.r, fill='white', width=3,
-                             tags=('vertex', vertex_label))
-        self.cnv.create_text(x, y, text=vertex_label, font=('Consolas', 16, 'bold'), tags='vertex_label')
         # Létrehozzuk a modellben is a csúcsobjektumot.
-        self.graph.vertices[vertex_label] = Vertex(vertex_label)
+        with self._graph_lock:
+            self.graph.add_vertex(vertex_label)
+        self.place_vertex(vertex_label, *self.to_world(event.x, event.y))
+        self.draw_vertex(vertex_label)
 
-    def get_vertex_and_label_item_ids(self, x, y):
-        """Az x,y koordinátáknál található csúcs és címke elem azonosítóival tér vissza."""
-        overlapping_items = self.cnv.find_overlapping(x - self.r, y - self.r, x + self.r, y + self.r)
-        vertex_ovalitem_id = [item_id for item_id in overlapping_items if self.cnv.type(item_id) == 'oval'][0]
-        vertex_label_textitem_id = [item_id for item_id in overlapping_items if self.cnv.type(item_id) == 'text'][0]
-        return vertex_ovalitem_id, vertex_label_textitem_id
+    def place_vertex(self, vertex_label: str, x, y):
+        """A csúcs helyének beállítása a térbeli indexben és a modellben, ahol az útvonalkeresés használja.
+        Az élek térbeli indexében a csúcsra illeszkedő, már elhelyezett végpontú éleket is áthelyezi.
+        """
+        self.vertex_grid.insert(vertex_label, x, y)
+        with self._graph_lock:
+            self.graph.set_vertex_position(vertex_label, x, y)
+        points, neighbors = self.vertex_grid.points, self.graph.neighbors.get(vertex_label, ())
+        for other_label in chain((neighbor_label for neighbor_label, _ in neighbors),
+                                 self.graph.in_neighbors.get(vertex_label, ())):
+            if other_label != vertex_label and other_label in points:
+                self.place_edge(vertex_label, other_label)
+
+    def place_edge(self, v1_lbl: str, v2_lbl: str):
+        """A két csúcs közötti él felvétele vagy áthelyezése az élek térbeli indexében."""
+        points = self.vertex_grid.points
+        self.edge_grid.insert(frozenset((v1_lbl, v2_lbl)), *points[v1_lbl], *points[v2_lbl])
+
+    def to_screen(self, x, y) -> tuple[float, float]:
+        """A csúcsok helyének koordinátáit a vászon koordinátáira váltja a nézet nagyítása és eltolása szerint."""
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def to_world(self, x, y) -> tuple[float, float]:
+        """A vászon koordinátáit a csúcsok helyének koordinátáira váltja."""
+        return (x - self.offset_x) / self.scale, (y - self.offset_y) / self.scale
+
+    def draw_vertex(self, vertex_label: str) -> int:
+        """Egy csúcs megrajzolása a helyének megfelelő középpontú körrel. A kör elem azonosítójával tér vissza."""
+        x, y = self.to_screen(*self.vertex_grid.points[vertex_label])
+        r = self.r * self.scale
+        # A csúcs egy körrel lesz ábrázolva, amelyben a csúcsazonosító címke mint szöveg látszik.
+        vertex_ovalitem_id = self.cnv.create_oval(x - r, y - r, x + r, y + r,
+                                                  fill=self.vertex_colors.get(vertex_label, 'white'),
+                                                  width=max(3 * self.scale, 1), tags=('vertex', vertex_label))
+        # Kis nagyításnál a címke olvashatatlan lenne, ezért nem rajzoljuk meg.
+        vertex_label_textitem_id = None
+        if self.scale >= self.lod_scale:
+            vertex_label_textitem_id = self.cnv.create_text(x, y, text=vertex_label, tags='vertex_label',
+                                                            font=('Consolas', round(16 * self.scale), 'bold'))
+        self.vertex_items[vertex_label] = (vertex_ovalitem_id, vertex_label_textitem_id)
+        return vertex_ovalitem_id
+
+    def vertex_at(self, x, y) -> str | None:
+        """A vászon x,y koordinátáinál található csúcs címkéje. Ha ott nincs csúcs, akkor None."""
+        return self.vertex_grid.nearest(*self.to_world(x, y), self.r)
+
+    def edge_at(self, x, y) -> int | None:
+        """A vászon x,y koordinátáihoz legközelebbi, attól legfeljebb egy csúcskör sugárnyira levő megrajzolt él
+        vonal elemének azonosítója, vagy None. A jelölt éleket az élek térbeli indexéből veszi, és közülük a
+        pont-szakasz távolság szerint legközelebbit választja.
+        """
+        x, y = self.to_world(x, y)
+        points, r = self.vertex_grid.points, self.r
+        nearest_line_id, nearest_distance = None, r ** 2
+        for edge in self.edge_grid.in_rect(x - r, y - r, x + r, y + r):
+            if (edge_line_id := self.edge_items.get(edge)) is None:
+                continue
+            v1_lbl, v2_lbl = self.item_edges[edge_line_id]
+            if (distance := segment_distance_squared(x, y, *points[v1_lbl], *points[v2_lbl])) <= nearest_distance:
+                nearest_line_id, nearest_distance = edge_line_id, distance
+        return nearest_line_id
 
     def select_vertices_and_connect(self, event, directed=False):
         """Csúcsok kijelölése éllel való összekötéshez. Ha mindkét csúcs ki van jelölve, akkor az
         összekötés is megtörténik.
         """
-        x, y = event.x, event.y
         # Az x,y helyen levő csúcs meghatározása.
-        selected_vertex = self.get_vertex_and_label_item_ids(x, y)[0]
+        if (selected_vertex := self.vertex_at(event.x, event.y)) is None:
+            return
 
         if self.selected_vertex1 is None:
             self.selected_vertex1 = selected_vertex
@@ -152,68 +665,303 @@ class GraphApp(tk.Tk):
         """A két kijelölt csúcs közé egy vonalat húz.
         Ha az él irányított, akkor a nyíl a korábban kijelölttől a később kijelöltig mutat.
         """
-        # Ellenőrizzük, hogy nincs-e már ilyen él.
-        for edge_line_id in self.cnv.find_withtag('edge'):
-            edge_line_tags = self.cnv.gettags(edge_line_id)
-            v1_id, v2_id = edge_line_tags[1], edge_line_tags[2]
-            if {v1_id, v2_id} == {str(self.selected_vertex1), str(self.selected_vertex2)}:
-                return
-        # Csúcsot önmagával nem kötünk össze.
-        if self.selected_vertex1 == self.selected_vertex2:
-            return
-
-        # Az eltérő, összekötendő csúcskörök befoglaló koordinátái, és középpont koordinátái.
-        v1_coords, v2_coords = self.cnv.coords(self.selected_vertex1), self.cnv.coords(self.selected_vertex2)
-        v1x0, v1y0 = (v1_coords[0] + v1_coords[2]) / 2, (v1_coords[1] + v1_coords[3]) / 2
-        v2x0, v2y0 = (v2_coords[0] + v2_coords[2]) / 2, (v2_coords[1] + v2_coords[3]) / 2
-        # A csúcsok középpontjait összekötő vonal rajzolása, és felcímkézve a kezdő- és végcsúcs körök azonosítójával.
-        edge_line_id = self.cnv.create_line(v1x0, v1y0, v2x0, v2y0, width=3,
-                                            tags=('edge', str(self.selected_vertex1), str(self.selected_vertex2)))
-        if directed:
+        v1_lbl, v2_lbl = self.selected_vertex1, self.selected_vertex2
+        # Csúcsot önmagával nem kötünk össze, és ellenőrizzük, hogy nincs-e már ilyen él.
+        if v1_lbl == v2_lbl or self.graph.has_edge(v1_lbl, v2_lbl) or self.graph.has_edge(v2_lbl, v1_lbl):
+            return
+
+        self.draw_edge(v1_lbl, v2_lbl, directed)
+        # Csúcsok összekötése a gráf modellben. Ha nem irányított az él, akkor mindkét irányban.
+        with self._graph_lock:
+            self.graph.add_connection(v1_lbl, v2_lbl)
+            if not directed:
+                self.graph.add_connection(v2_lbl, v1_lbl)
+        self.place_edge(v1_lbl, v2_lbl)
+
+    def draw_edge(self, v1_lbl: str, v2_lbl: str, directed=False, lower=True) -> int:
+        """A két csúcs köre közé egy vonalat húz, irányított él esetén nyíllal. A vonal elem azonosítójával
+        tér vissza. Ha a lower igaz, akkor a vonalat a többi elem alá helyezi.
+        """
+        # Az összekötendő csúcskörök középpont koordinátái a vásznon.
+        v1x0, v1y0 = self.to_screen(*self.vertex_grid.points[v1_lbl])
+        v2x0, v2y0 = self.to_screen(*self.vertex_grid.points[v2_lbl])
+        # A csúcsok középpontjait összekötő vonal rajzolása.
+        fill = 'red' if self.selected_edge == (v1_lbl, v2_lbl) else self.edge_color(v1_lbl, v2_lbl)
+        edge_line_id = self.cnv.create_line(v1x0, v1y0, v2x0, v2y0, width=max(3 * self.scale, 1), fill=fill,
+                                            tags='edge')
+        # Kis nagyításnál a nyílhegyeket nem rajzoljuk meg.
+        length = pow((v2x0 - v1x0) ** 2 + (v2y0 - v1y0) ** 2, 0.5)
+        if directed and self.scale >= self.lod_scale and length:
             self.cnv.itemconfig(edge_line_id, arrow=tk.LAST, arrowshape=(10, 12, 5))
-            length = pow((v2x0 - v1x0) ** 2 + (v2y0 - v1y0) ** 2, 0.5)
-            reduced_length = length - self.r - 15
+            reduced_length = length - (self.r + 15) * self.scale
             scale_factor = reduced_length / length
             self.cnv.scale(edge_line_id, (v1x0 + v2x0) / 2, (v1y0 + v2y0) / 2, scale_factor, scale_factor)
 
         # Az összekötővonalat a megjelenítési lista legaljára helyezzük, hogy ne takarja el a csúcskört és címkét.
-        self.cnv.tag_lower(edge_line_id)
-        # Kikeressük az összekötendő csúcsok címkéit, hogy a modellben is össze tudjuk kötni egy éllel.
-        v1_lbl, v2_lbl = self.cnv.gettags(self.selected_vertex1)[1], self.cnv.gettags(self.selected_vertex2)[1]
-        # Csúcsok összekötése a gráf modellben. Ha nem irányított az él, akkor mindkét irányban.
-        self.graph.add_connection(v1_lbl, v2_lbl)
-        if not directed:
-            self.graph.add_connection(v2_lbl, v1_lbl)
+        if lower:
+            self.cnv.tag_lower(edge_line_id)
+        self.edge_items[frozenset((v1_lbl, v2_lbl))] = edge_line_id
+        self.item_edges[edge_line_id] = (v1_lbl, v2_lbl)
+        return edge_line_id
+
+    def edge_color(self, v1_lbl: str, v2_lbl: str) -> str:
+        """A nem kijelölt él vonalának színe: a kiemelt útvonal élei route_color, a többi fekete."""
+        return self.route_color if frozenset((v1_lbl, v2_lbl)) in self.route_edges else 'black'
+
+    def select_route_vertex(self, event):
+        """Az első kijelölt csúcs az útvonal kezdőcsúcsa, a második a célcsúcsa. A célcsúcs kijelölése után
+        a két csúcs közötti legrövidebb utat a csúcsok helyét felhasználó A* kereséssel határozza meg, és az
+        útvonal csúcsait és éleit kiemeli.
+        """
+        if (vertex_label := self.vertex_at(event.x, event.y)) is None:
+            return
+        if self.route_start is None:
+            self.cancel_algorithm()
+            self.clear_vertex_colors()
+            self.clear_route()
+            self.route_start = vertex_label
+            self.set_vertex_color(vertex_label, self.route_color)
+            self.output_var.set(f'Útvonal kezdőcsúcsa: {vertex_label}\nCélcsúcs kijelölése: Shift + bal egérgomb')
+            return
+        start_label, self.route_start = self.route_start, None
+        try:
+            distance, path = self.graph.shortest_path(start_label, vertex_label)
+        except TypeError as e:
+            self.output_var.set(f'Hiba: {e}')
+            return
+        if not path:
+            self.clear_vertex_colors()
+            self.output_var.set(f'A {vertex_label} csúcs nem érhető el a {start_label} csúcsból.')
+            return
+        for path_vertex_label in path:
+            self.set_vertex_color(path_vertex_label, self.route_color)
+        self.route_edges = {frozenset(edge) for edge in zip(path, path[1:])}
+        for edge in self.route_edges:
+            if (edge_line_id := self.edge_items.get(edge)) is not None:
+                self.cnv.itemconfig(edge_line_id, fill=self.route_color)
+        self.output_var.set(f'Legrövidebb út {start_label} {chr(0x279E)} {vertex_label}: {distance:g}\n'
+                            f'{f" {chr(0x279E)} ".join(path)}')
+
+    def clear_route(self):
+        """A kiemelt útvonal éleinek visszaállítása az alapértelmezett színre."""
+        route_edges, self.route_edges = self.route_edges, set()
+        for edge in route_edges:
+            if (edge_line_id := self.edge_items.get(edge)) is not None and \
+                    self.item_edges[edge_line_id] != self.selected_edge:
+                self.cnv.itemconfig(edge_line_id, fill='black')
+
+    def edges_to_draw(self, vertex_pairs: Iterable[frozenset[str]]) -> list[tuple[str, str, bool]]:
+        """Az adott csúcspárok közötti, megrajzolandó élek (kezdőcsúcs, végcsúcs, irányított-e) hármasai.
+        Ha két csúcs között mindkét irányban van él, akkor azt egyszer, nem irányított élként adja vissza.
+        """
+        has_edge = self.graph.has_edge
+        edges = []
+        for v1_lbl, v2_lbl in map(sorted, vertex_pairs):
+            forward, backward = has_edge(v1_lbl, v2_lbl), has_edge(v2_lbl, v1_lbl)
+            if forward:
+                edges.append((v1_lbl, v2_lbl, not backward))
+            elif backward:
+                edges.append((v2_lbl, v1_lbl, True))
+        return edges
+
+    def render(self):
+        """A nézetbe eső csúcsok és élek újrarajzolása. A nézeten kívüli csúcsokat nem rajzolja meg, az éleket
+        pedig csak akkor, ha a befoglaló téglalapjuk metszi a nézetet. A rajzolás render_batch_size elemenként,
+        az eseménykezelések között halad, így nagy gráf esetén sem akad meg a felület.
+        """
+        self.cancel_render()
+        self.cnv.delete('all')
+        self.clear_item_indexes()
+        # A nézet által lefedett terület a csúcsok koordinátarendszerében, a csúcskörök sugarával kibővítve.
+        x0, y0 = self.to_world(0, 0)
+        x1, y1 = self.to_world(self.cnv.winfo_width(), self.cnv.winfo_height())
+        x0, y0, x1, y1 = x0 - self.r, y0 - self.r, x1 + self.r, y1 + self.r
+        visible_vertices = list(self.vertex_grid.in_rect(x0, y0, x1, y1))
+        # Előbb az éleket rajzoljuk meg, hogy a csúcsok köre és címkéje ezek felett legyen.
+        self._render_queue = chain(
+            ((self.draw_queued_edge, (v1_lbl, v2_lbl, directed))
+             for v1_lbl, v2_lbl, directed in self.edges_to_draw(self.edge_grid.in_rect(x0, y0, x1, y1))),
+            ((self.draw_vertex, (vertex_label,)) for vertex_label in visible_vertices))
+        self._render_batch()
+
+    def draw_queued_edge(self, v1_lbl: str, v2_lbl: str, directed: bool):
+        """A render által sorba állított él megrajzolása. A rajzolás az eseménykezelések között halad, így az élt
+        közben törölhették vagy már újra megrajzolhatták: ekkor nem rajzolja meg.
+        """
+        has_edge = self.graph.has_edge
+        if frozenset((v1_lbl, v2_lbl)) not in self.edge_items and \
+                (has_edge(v1_lbl, v2_lbl) or has_edge(v2_lbl, v1_lbl)):
+            self.draw_edge(v1_lbl, v2_lbl, directed, False)
+
+    def _render_batch(self):
+        self._render_job = None
+        batch = list(islice(self._render_queue, self.render_batch_size))
+        for draw, args in batch:
+            draw(*args)
+        if len(batch) == self.render_batch_size:
+            self._render_job = self.after(1, self._render_batch)
+
+    def cancel_render(self):
+        """A folyamatban levő és az ütemezett rajzolás leállítása."""
+        for job in (self._render_job, self._schedule_render_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._render_job = self._schedule_render_job = None
+        self._render_queue = iter(())
+
+    def schedule_render(self, delay=50):
+        """Újrarajzolás ütemezése. A gyors egymásutánban érkező kérések (nagyítás, görgetés) egyetlen
+        újrarajzolást váltanak ki.
+        """
+        if self._schedule_render_job is not None:
+            self.after_cancel(self._schedule_render_job)
+
+        def run():
+            self._schedule_render_job = None
+            self.render()
+
+        self._schedule_render_job = self.after(delay, run)
+
+    def zoom(self, event, factor):
+        """A nézet nagyítása vagy kicsinyítése az egérmutató helye körül."""
+        x, y = self.to_world(event.x, event.y)
+        factor = min(max(self.scale * factor, 0.01), 20) / self.scale
+        self.scale *= factor
+        self.offset_x, self.offset_y = event.x - x * self.scale, event.y - y * self.scale
+        # Azonnali visszajelzésként a meglevő elemeket átméretezzük, majd a nézetet újrarajzoljuk.
+        self.cnv.scale('all', event.x, event.y, factor, factor)
+        self.schedule_render()
+
+    def pan_start(self, event):
+        self._pan_start = (event.x, event.y)
+
+    def pan_move(self, event):
+        """A nézet eltolása az egérmutató elmozdulásával."""
+        if self._pan_start is None:
+            return
+        dx, dy = event.x - self._pan_start[0], event.y - self._pan_start[1]
+        self._pan_start = (event.x, event.y)
+        self.offset_x += dx
+        self.offset_y += dy
+        self.cnv.move('all', dx, dy)
+
+    def load_edge_file(self):
+        """Egy élistát tartalmazó fájl kiválasztása és betöltése. A beolvasás előrehaladását a kimeneti
+        felületen jelzi, a betöltött gráfot pedig a vásznon egy kör mentén elhelyezve rajzolja meg.
+        """
+        path = filedialog.askopenfilename(parent=self, title='Élfájl betöltése',
+                                          filetypes=[('Élfájl', '*.txt *.csv *.tsv *.edges'), ('Minden fájl', '*')])
+        if not path:
+            return
+
+        def show_progress(bytes_read, total_bytes):
+            self.output_var.set(f'Betöltés: {100 * bytes_read // max(total_bytes, 1)}%')
+            self.update_idletasks()
+
+        delimiter = ',' if path.endswith('.csv') else None
+        try:
+            graph = Graph.from_edge_file(path, delimiter=delimiter, progress=show_progress)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            self.output_var.set(f'Hiba a betöltéskor:\n{e}')
+            return
+        self.clear()
+        self.graph = graph
+        self.graph.enable_instrumentation(self.instrumentation)
+        self.draw_graph()
+        self.output_var.set(f'Betöltve: {len(graph.vertices)} csúcs, {graph.edge_count} él')
+
+    def circle_positions(self) -> dict[str, tuple[float, float]]:
+        """A modell csúcsainak elhelyezése a vászon közepe körüli kör mentén."""
+        self.update_idletasks()
+        width, height = self.cnv.winfo_width() / self.scale, self.cnv.winfo_height() / self.scale
+        x0, y0 = self.to_world(0, 0)
+        radius = max(min(width, height) / 2 - 2 * self.r, self.r)
+        n = max(len(self.graph.vertices), 1)
+        return {vertex_label: (x0 + width / 2 + radius * cos(2 * pi * i / n),
+                               y0 + height / 2 + radius * sin(2 * pi * i / n))
+                for i, vertex_label in enumerate(self.graph.vertices)}
+
+    def vertex_positions(self) -> dict[str, tuple[float, float]]:
+        """A vásznon levő csúcskörök középpontjai a csúcsok címkéi szerint."""
+        return dict(self.vertex_grid.points)
+
+    def save_snapshot(self):
+        """Az aktuális gráf mentése bináris pillanatkép fájlba a csúcsok vásznon levő helyével együtt."""
+        path = filedialog.asksaveasfilename(parent=self, title='Mentés', defaultextension='.graph',
+                                            filetypes=[('Gráf pillanatkép', '*.graph')])
+        if not path:
+            return
+        try:
+            self.graph.save(path, self.vertex_positions())
+        except (OSError, TypeError) as e:
+            self.output_var.set(f'Hiba a mentéskor:\n{e}')
+            return
+        self.output_var.set(f'Mentve: {path}')
+
+    def open_snapshot(self):
+        """Egy bináris pillanatkép fájlba mentett gráf betöltése és megrajzolása."""
+        path = filedialog.askopenfilename(parent=self, title='Megnyitás', filetypes=[('Gráf pillanatkép', '*.graph')])
+        if not path:
+            return
+        try:
+            compact_graph = CompactGraph.load(path)
+            graph = compact_graph.to_graph()
+        except (OSError, ValueError) as e:
+            self.output_var.set(f'Hiba a megnyitáskor:\n{e}')
+            return
+        self.clear()
+        self.graph = graph
+        self.graph.enable_instrumentation(self.instrumentation)
+        self.draw_graph(compact_graph.vertex_coords() or None)
+
+    def draw_graph(self, positions: dict[str, tuple[float, float]] | None = None):
+        """A modellben levő gráf megrajzolása. A csúcsokat a positions szótárban megadott helyekre, ennek
+        hiányában a vászon közepe körüli kör mentén helyezi el.
+        Ha két csúcs között mindkét irányban van él, akkor azt nem irányított élként rajzolja meg.
+        """
+        if positions is None:
+            positions = self.circle_positions()
+        self.vertex_grid.clear()
+        self.edge_grid.clear()
+        for vertex_label in self.graph.vertices:
+            self.place_vertex(vertex_label, *positions[vertex_label])
+        self.render()
+        # Az új csúcsok címkéi a betöltött egész számú címkék után folytatódnak.
+        self.vertex_label_gen = count(max((int(label) + 1 for label in self.graph.vertices if label.isdigit()),
+                                          default=0))
 
     def select_edge(self, event):
         """Az egérmutatóhoz legközelebb eső élt kijelöltnek címkéz, és megváltoztatja a színét.
         Ha egy már kijelölt él a legközelebbi él, akkor a kijelölést érvényteleníti.
         """
-        x, y = event.x, event.y
         # Megnézzük, hogy van-e már kijelölt él. Ha van, akkor azt nem kijelöltté tesszük.
-        if old_edges := self.cnv.find_withtag('selected_edge'):
-            self.cnv.dtag(old_edges[0], 'selected_edge')
-            self.cnv.itemconfig(old_edges[0], fill='black')
+        old_edge, self.selected_edge = self.selected_edge, None
+        if old_edge is not None and (old_edge_line_id := self.edge_items.get(frozenset(old_edge))):
+            self.cnv.dtag(old_edge_line_id, 'selected_edge')
+            self.cnv.itemconfig(old_edge_line_id, fill=self.edge_color(*old_edge))
 
         # Az egérmutatónál levő élt kijelöltnek nyilvánítjuk egy taggel, és
         # megváltoztatjuk a vonal alapszínét.
-        new_edges = self.cnv.find_closest(x, y)
-        if new_edges != old_edges:
-            self.cnv.addtag_closest('selected_edge', x, y)
-            self.cnv.itemconfig(new_edges[0], fill='red')
+        new_edge_line_id = self.edge_at(event.x, event.y)
+        if new_edge_line_id is not None and (new_edge := self.item_edges[new_edge_line_id]) != old_edge:
+            self.selected_edge = new_edge
+            self.cnv.addtag_withtag('selected_edge', new_edge_line_id)
+            self.cnv.itemconfig(new_edge_line_id, fill='red')
 
     def remove_edge(self, event):
-        x, y = event.x, event.y
-        if self.cnv.find_withtag('selected_edge'):
-            edge_to_remove = self.cnv.find_withtag('selected_edge')[0]
-            # A kijelölt él eltávolítása a vászonról.
-            x1, y1, x2, y2 = self.cnv.coords(edge_to_remove)
-            v1_id, v1_lbl_id = self.get_vertex_and_label_item_ids(x1, y1)
-            v2_id, v2_lbl_id = self.get_vertex_and_label_item_ids(x2, y2)
+        """A kijelölt él eltávolítása a vászonról és a modellből."""
+        if self.selected_edge is None:
+            return
+        (v1_lbl, v2_lbl), self.selected_edge = self.selected_edge, None
+        # A kijelölt él eltávolítása a vászonról.
+        if (edge_to_remove := self.edge_items.pop(frozenset((v1_lbl, v2_lbl)), None)) is not None:
+            del self.item_edges[edge_to_remove]
             self.cnv.delete(edge_to_remove)
-            # A kijelölt él eltávolítása a modellből.
-            v1_lbl, v2_lbl = self.cnv.itemcget(v1_lbl_id, 'text'), self.cnv.itemcget(v2_lbl_id, 'text')
+        # A kijelölt él eltávolítása a modellből.
+        with self._graph_lock:
             self.graph.remove_edge(v1_lbl, v2_lbl)
+        if (edge := frozenset((v1_lbl, v2_lbl))) in self.edge_grid.segments:
+            self.edge_grid.remove(edge)
 
     def run(self):
         self.mainloop()